@@ -0,0 +1,171 @@
+from collections import defaultdict
+
+import numpy as np
+
+from carta_batch import OBLIQUITA, punti_cardinali_batch, tempo_siderale_locale
+from effemeridi import CORPI, posizioni_eclittiche
+
+ANGOLI = ("ASC", "DSC", "MC", "IC")
+
+
+def _segmenti(campo, lon, lat, riga0, campo_esatto, iterazioni):
+    """
+    Marching squares sul campo `campo` (righe = latitudini, colonne = longitudini).
+
+    Restituisce i segmenti come coppie di identificativi di lato e, per ogni lato
+    attraversato, il punto (lon, lat) dello zero, raffinato per bisezione lungo il
+    lato con `campo_esatto(lon, lat)`. Un lato conta solo se il campo è continuo
+    (niente salti ±180° dovuti all'angolo relativo).
+    """
+    n_colonne = campo.shape[1]
+    negativo = campo < 0
+    continuo = np.abs(campo) < 90
+
+    # Lati orizzontali (r, c)-(r, c+1) e verticali (r, c)-(r+1, c)
+    orizzontali = (negativo[:, :-1] ^ negativo[:, 1:]) & continuo[:, :-1] & continuo[:, 1:]
+    verticali = (negativo[:-1, :] ^ negativo[1:, :]) & continuo[:-1, :] & continuo[1:, :]
+
+    # Per ogni cella i quattro lati in ordine: sotto, destra, sopra, sinistra
+    lati = (orizzontali[:-1, :], verticali[:, 1:], orizzontali[1:, :], verticali[:, :-1])
+    conteggio = sum(l.view(np.uint8) for l in lati)
+    r, c = np.nonzero(conteggio)
+    if r.size == 0:
+        return np.empty((0, 2), dtype=np.int64), {}
+    attraversati = np.stack([l[r, c] for l in lati], axis=-1)
+
+    # Identificativi globali dei lati: pari gli orizzontali, dispari i verticali.
+    # Ogni lato è dato dal suo vertice iniziale (riga, colonna) e dalla direzione.
+    r_lato = r[:, None] + np.array([0, 0, 1, 0])
+    c_lato = c[:, None] + np.array([0, 1, 0, 0])
+    verticale = np.array([False, True, False, True])
+    ids = 2 * ((riga0 + r_lato) * n_colonne + c_lato) + verticale
+
+    segmenti = []
+    for n_lati in (2, 4):  # 4 lati: punto di sella, si accoppiano nell'ordine
+        celle = conteggio[r, c] == n_lati
+        if celle.any():
+            segmenti.append(ids[celle][attraversati[celle]].reshape(-1, 2))
+    segmenti = np.concatenate(segmenti) if segmenti else np.empty((0, 2), dtype=np.int64)
+
+    # Punto di zero su ciascun lato attraversato, per bisezione sul lato
+    ids, primo = np.unique(ids[attraversati], return_index=True)
+    rl, cl = r_lato[attraversati][primo], c_lato[attraversati][primo]
+    vert = np.broadcast_to(verticale, attraversati.shape)[attraversati][primo]
+    lon0, lat0 = lon[cl], lat[rl]
+    lon1 = np.where(vert, lon0, lon[np.minimum(cl + 1, lon.size - 1)])
+    lat1 = np.where(vert, lat[np.minimum(rl + 1, lat.size - 1)], lat0)
+    a, b = np.zeros(ids.size), np.ones(ids.size)
+    fa = campo[rl, cl]
+    for _ in range(iterazioni):
+        m = 0.5 * (a + b)
+        fm = campo_esatto(lon0 + m * (lon1 - lon0), lat0 + m * (lat1 - lat0))
+        sinistra = (fa < 0) != (fm < 0)
+        b = np.where(sinistra, m, b)
+        a = np.where(sinistra, a, m)
+        fa = np.where(sinistra, fa, fm)
+    t = 0.5 * (a + b)
+    x, y = lon0 + t * (lon1 - lon0), lat0 + t * (lat1 - lat0)
+    return segmenti, dict(zip(ids.tolist(), zip(x.tolist(), y.tolist())))
+
+
+def _polilinee(segmenti, punti):
+    """Unisce i segmenti (coppie di lati condivisi) in polilinee di punti (lon, lat)."""
+    vicini = defaultdict(list)
+    for a, b in segmenti:
+        vicini[a].append(b)
+        vicini[b].append(a)
+
+    visitati = set()
+    polilinee = []
+    # Prima le catene aperte (estremi con un solo vicino), poi gli anelli
+    inizi = [n for n, v in vicini.items() if len(v) == 1] + list(vicini)
+    for inizio in inizi:
+        if inizio in visitati:
+            continue
+        catena = [inizio]
+        visitati.add(inizio)
+        corrente = inizio
+        while True:
+            successivo = next((v for v in vicini[corrente] if v not in visitati), None)
+            if successivo is None:
+                break
+            catena.append(successivo)
+            visitati.add(successivo)
+            corrente = successivo
+        if len(catena) > 1:
+            polilinee.append(np.array([punti[n] for n in catena]))
+    return polilinee
+
+
+def linee_astrocartografia(jd, nomi=None, risoluzione=0.1, latitudine_max=80.0,
+                           obliquita=OBLIQUITA, righe_per_blocco=100, iterazioni=12, backend="auto"):
+    """
+    Linee ASC/DSC/MC/IC dei pianeti su tutto il globo per un istante.
+
+    Su una griglia lat/lon si calcolano gli angoli con `punti_cardinali_batch`
+    (ascendente di legacy/asc.py, MC di legacy/advanced.py) e si cercano i luoghi dove un angolo coincide con la longitudine eclittica del
+    pianeta (linee "in zodiaco"). La griglia è elaborata a blocchi di righe, così la
+    memoria dipende da `righe_per_blocco` e non dalla risoluzione. I punti delle
+    polilinee stanno sui lati delle celle e sono raffinati con la formula esatta.
+
+    Non si usano le formule di `axes.calcola_punti_cardinali`: il suo MC applica
+    la relazione inversa (da longitudine ad ascensione retta) e il suo ASC usa la
+    latitudine dove va l'obliquità, con scarti di alcuni gradi. Le linee devono
+    coincidere con gli angoli delle carte, che vengono da `punti_cardinali_batch`.
+
+    Args:
+        jd (float): Giorno giuliano (UT).
+        nomi (list): Corpi da considerare (default tutti quelli di `effemeridi.CORPI`).
+        risoluzione (float): Passo della griglia in gradi.
+        latitudine_max (float): La griglia copre [-latitudine_max, +latitudine_max].
+        obliquita (float): Obliquità dell'eclittica in gradi.
+        righe_per_blocco (int): Righe di latitudine elaborate insieme.
+        iterazioni (int): Passi di bisezione per posizionare ogni punto sul lato della cella.
+        backend (str): Backend dei kernel degli angoli ("auto", "numba" o "numpy").
+
+    Returns:
+        dict: (nome, angolo) -> lista di polilinee, array (k, 2) di (lon, lat) in gradi.
+    """
+    nomi = list(CORPI) if nomi is None else list(nomi)
+    lon = np.linspace(-180.0, 180.0, int(round(360.0 / risoluzione)) + 1)
+    lat = np.linspace(-latitudine_max, latitudine_max, int(round(2 * latitudine_max / risoluzione)) + 1)
+
+    longitudini_eclittiche, _, _ = posizioni_eclittiche(nomi, np.array([jd]))
+    longitudini_eclittiche = longitudini_eclittiche[:, 0]
+    lst = tempo_siderale_locale(jd, lon)  # dipende solo dalla longitudine
+
+    segmenti = defaultdict(list)
+    punti = defaultdict(dict)
+    for riga0 in range(0, lat.size - 1, righe_per_blocco):
+        righe = lat[riga0:riga0 + righe_per_blocco + 1]  # una riga in comune con il blocco successivo
+        angoli = punti_cardinali_batch(lst[None, :] / 15, righe[:, None], obliquita, backend=backend)
+        for nome, lambda_ in zip(nomi, longitudini_eclittiche):
+            for angolo in ANGOLI:
+                def campo_esatto(x, y, angolo=angolo, lambda_=lambda_):
+                    valore = punti_cardinali_batch(tempo_siderale_locale(jd, x) / 15, y, obliquita,
+                                                   backend=backend)[angolo]
+                    return (valore - lambda_ + 180.0) % 360.0 - 180.0
+
+                campo = (angoli[angolo] - lambda_ + 180.0) % 360.0 - 180.0
+                s, p = _segmenti(campo, lon, righe, riga0, campo_esatto, iterazioni)
+                segmenti[nome, angolo].append(s)
+                punti[nome, angolo].update(p)
+
+    return {
+        chiave: _polilinee(np.concatenate(segmenti[chiave]).tolist(), punti[chiave])
+        for chiave in segmenti
+    }
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    import time
+    from astropy.time import Time
+
+    jd = Time("1993-06-10 10:15:00").jd
+    inizio = time.perf_counter()
+    linee = linee_astrocartografia(jd, risoluzione=0.1)
+    print(f"Calcolate in {time.perf_counter() - inizio:.2f} s")
+    for (nome, angolo), polilinee in linee.items():
+        n_punti = sum(len(p) for p in polilinee)
+        print(f"{nome:9s} {angolo}: {len(polilinee)} polilinee, {n_punti} punti")
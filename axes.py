@@ -51,19 +51,20 @@ def calcola_punti_cardinali(ora_siderale_locale, latitudine, obliquita=23.43):
     return {"ASC": ASC, "DSC": DSC, "MC": MC, "IC": IC}
 
 
-ora_siderale_locale = 4.20727  # Ore
-latitudine = 45.0  # Gradi Nord
-longitudine = 10.58  # Gradi Est
-obliquita = 23.4367    # Obliquità eclittica (J2000)
+if __name__ == "__main__":
+    ora_siderale_locale = 4.20727  # Ore
+    latitudine = 45.0  # Gradi Nord
+    longitudine = 10.58  # Gradi Est
+    obliquita = 23.4367    # Obliquità eclittica (J2000)
 
-punti_cardinali = calcola_punti_cardinali(ora_siderale_locale, latitudine, obliquita)
+    punti_cardinali = calcola_punti_cardinali(ora_siderale_locale, latitudine, obliquita)
 
-print("Ascendente (ASC):", punti_cardinali["ASC"])
-print("Discendente (DSC):", punti_cardinali["DSC"])
-print("Medio Cielo (MC):", punti_cardinali["MC"])
-print("Fondo Cielo (IC):", punti_cardinali["IC"])
+    print("Ascendente (ASC):", punti_cardinali["ASC"])
+    print("Discendente (DSC):", punti_cardinali["DSC"])
+    print("Medio Cielo (MC):", punti_cardinali["MC"])
+    print("Fondo Cielo (IC):", punti_cardinali["IC"])
 
-print("Segno Ascendente:", calculate_single_sign(punti_cardinali["ASC"]))
-print("Segno Discendente:", calculate_single_sign(punti_cardinali["DSC"]))
-print("Segno Medio Cielo:", calculate_single_sign(punti_cardinali["MC"]))
-print("Segno Fondo Cielo:", calculate_single_sign(punti_cardinali["IC"]))
+    print("Segno Ascendente:", calculate_single_sign(punti_cardinali["ASC"]))
+    print("Segno Discendente:", calculate_single_sign(punti_cardinali["DSC"]))
+    print("Segno Medio Cielo:", calculate_single_sign(punti_cardinali["MC"]))
+    print("Segno Fondo Cielo:", calculate_single_sign(punti_cardinali["IC"]))
@@ -0,0 +1,108 @@
+import numpy as np
+
+J2000 = 2451545.0
+
+# Ayanamsa a J2000.0 in gradi (valori di riferimento della Swiss Ephemeris)
+AYANAMSA_J2000 = {
+    "lahiri": 23.857092,
+    "raman": 22.410791,
+    "krishnamurti": 23.760240,
+    "fagan_bradley": 24.740300,
+}
+
+NAKSHATRA = (
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu",
+    "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta",
+    "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha",
+    "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
+    "Uttara Bhadrapada", "Revati",
+)
+AMPIEZZA_NAKSHATRA = 360.0 / 27   # 13°20'
+AMPIEZZA_PADA = AMPIEZZA_NAKSHATRA / 4  # 3°20'
+
+
+def precessione_generale(jd):
+    """
+    Precessione generale in longitudine da J2000 (IAU 2006), in gradi, su array.
+
+    Args:
+        jd (array): Giorni giuliani (la differenza TT-UT è trascurabile qui).
+
+    Returns:
+        array: Precessione accumulata in gradi (negativa prima del 2000).
+    """
+    T = (np.asarray(jd, dtype=float) - J2000) / 36525.0
+    return T * (5028.796195 + T * (1.1054348 + T * (0.00007964 - T * 0.000023857))) / 3600.0
+
+
+def ayanamsa(jd, modello="lahiri"):
+    """
+    Ayanamsa (distanza fra equinozio tropicale e origine dello zodiaco siderale).
+
+    Il valore a J2000 viene fatto avanzare con la precessione generale: rispetto
+    alla Swiss Ephemeris lo scarto resta nell'ordine del secondo d'arco per
+    qualche secolo attorno al 2000.
+
+    Args:
+        jd (array): Giorni giuliani.
+        modello (str): "lahiri", "raman", "krishnamurti" o "fagan_bradley".
+
+    Returns:
+        array: Ayanamsa in gradi.
+    """
+    try:
+        riferimento = AYANAMSA_J2000[modello]
+    except KeyError:
+        raise ValueError(f"Ayanamsa sconosciuta: {modello}") from None
+    return riferimento + precessione_generale(jd)
+
+
+def in_siderale(longitudini, jd, modello="lahiri"):
+    """
+    Converte longitudini tropicali in siderali sul posto, senza copie dell'array.
+
+    Args:
+        longitudini (np.ndarray): Longitudini in gradi (float), modificate sul posto.
+        jd (array): Giorni giuliani, broadcast con `longitudini`.
+        modello (str): Modello di ayanamsa.
+
+    Returns:
+        np.ndarray: Lo stesso array `longitudini`.
+    """
+    np.subtract(longitudini, ayanamsa(jd, modello), out=longitudini)
+    np.mod(longitudini, 360.0, out=longitudini)
+    return longitudini
+
+
+def nakshatra(longitudine_siderale):
+    """
+    Nakshatra e pada di longitudini siderali, su array.
+
+    Returns:
+        tuple: (indice, pada): indice in `NAKSHATRA` (0-26) e pada (1-4). Per le
+        longitudini NaN (es. cuspidi Placidus senza soluzione ad alte latitudini)
+        indice = -1 e pada = 0: controllare `indice >= 0` prima di usare `NAKSHATRA`.
+    """
+    longitudine = np.asarray(longitudine_siderale, dtype=float)
+    valida = np.isfinite(longitudine)
+    longitudine = np.mod(np.where(valida, longitudine, 0.0), 360.0)
+    indice = np.minimum(longitudine // AMPIEZZA_NAKSHATRA, 26).astype(np.int8)
+    pada = np.minimum((longitudine % AMPIEZZA_NAKSHATRA) // AMPIEZZA_PADA, 3).astype(np.int8) + 1
+    return np.where(valida, indice, np.int8(-1)), np.where(valida, pada, np.int8(0))
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    from carta_batch import CartaBatch
+
+    # New Delhi, 11 aprile 2025 ore 12:00 IST (06:30 UTC), come legacy/india.py
+    jd = 2460776.770833
+    carta = CartaBatch.calcola(jd, 28.6139, 77.2090, ayanamsa="lahiri")[0]
+    print(f"Ayanamsa Lahiri: {float(ayanamsa(jd)):.6f}°")
+    for nome, longitudine in carta.pianeti().items():
+        indice, pada = nakshatra(longitudine)
+        print(f"{nome}: {longitudine:.2f}° → {NAKSHATRA[indice]} pada {pada}")
+    for casa, cuspide in enumerate(carta.cuspidi, start=1):
+        indice, pada = nakshatra(cuspide)
+        segno = f"{NAKSHATRA[indice]} pada {pada}" if indice >= 0 else "nessuna soluzione"
+        print(f"Casa {casa}: {cuspide:.2f}° → {segno}")
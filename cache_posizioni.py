@@ -0,0 +1,234 @@
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from effemeridi import CORPI, eclittiche_esatte, scala_tempi
+from profilazione import PROFILO
+
+PERCORSO_PREDEFINITO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dati", "posizioni.sqlite")
+
+# Livelli di precisione: passo della griglia di istanti TT, in secondi.
+# Con "bassa" la Luna può essere fuori di ~0.3°, con "media" di ~0.005°.
+LIVELLI = {
+    "bassa": 3600,
+    "media": 60,
+    "alta": 1,
+}
+
+# Limite di variabili per istruzione delle versioni più vecchie di SQLite
+_LOTTO = 900
+
+# L'ultimo uso di una riga viene aggiornato al più una volta in questo intervallo
+# (secondi): per lo sfratto basta un ordine approssimato, e così le letture non
+# scrivono quasi mai e non si mettono in coda sul lock di scrittura del WAL
+RINNOVO_ACCESSO = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posizioni (
+    corpo TEXT NOT NULL,
+    livello INTEGER NOT NULL,     -- passo della griglia in secondi
+    istante INTEGER NOT NULL,     -- TT in multipli del passo
+    longitudine REAL NOT NULL,
+    latitudine REAL NOT NULL,
+    velocita REAL NOT NULL,
+    accesso REAL NOT NULL,        -- ultimo uso (tempo Unix), per lo sfratto
+    PRIMARY KEY (corpo, livello, istante)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS posizioni_accesso ON posizioni (accesso);
+
+-- Numero di righe tenuto dai trigger: COUNT(*) scandirebbe tutta la tabella.
+-- Una sola riga, inizializzata (con l'unico COUNT(*)) solo se manca.
+CREATE TABLE IF NOT EXISTS conteggio (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    righe INTEGER NOT NULL
+);
+INSERT INTO conteggio SELECT 1, (SELECT COUNT(*) FROM posizioni) WHERE NOT EXISTS (SELECT 1 FROM conteggio);
+CREATE TRIGGER IF NOT EXISTS posizioni_inserite AFTER INSERT ON posizioni
+BEGIN UPDATE conteggio SET righe = righe + 1; END;
+CREATE TRIGGER IF NOT EXISTS posizioni_eliminate AFTER DELETE ON posizioni
+BEGIN UPDATE conteggio SET righe = righe - 1; END;
+"""
+
+
+class CachePosizioni:
+    """
+    Cache persistente su disco delle posizioni eclittiche, condivisa fra processi.
+
+    Le chiavi sono (corpo, istante TT quantizzato, livello): una richiesta viene
+    servita con la posizione esatta dell'istante della griglia più vicino. Il file
+    SQLite è in modalità WAL, così i lettori non bloccano lo scrittore; scritture
+    concorrenti attendono fino a `attesa` secondi. Quando le righe superano
+    `max_righe`, vengono eliminate le meno usate di recente; l'ultimo uso è
+    registrato con una risoluzione di `RINNOVO_ACCESSO` secondi.
+
+    Si usa con `effemeridi.posizioni_eclittiche(..., cache=CachePosizioni())`.
+    """
+
+    def __init__(self, percorso=PERCORSO_PREDEFINITO, livello="media", max_righe=5_000_000, attesa=30.0):
+        try:
+            self.passo = LIVELLI[livello]
+        except KeyError:
+            raise ValueError(f"Livello sconosciuto: {livello}") from None
+        self.percorso = percorso
+        self.livello = livello
+        self.max_righe = max_righe
+        self.attesa = attesa
+        self.trovati = 0
+        self.mancanti = 0
+        self._connessione = None
+        self._pid = None
+
+    @property
+    def connessione(self):
+        # Una connessione per processo: quelle SQLite non sopravvivono a un fork
+        if self._connessione is None or self._pid != os.getpid():
+            connessione = sqlite3.connect(self.percorso, timeout=self.attesa, isolation_level=None)
+            connessione.execute(f"PRAGMA busy_timeout = {int(self.attesa * 1000)}")
+            connessione.execute("PRAGMA journal_mode = WAL")
+            connessione.execute("PRAGMA synchronous = NORMAL")
+            connessione.executescript(f"BEGIN IMMEDIATE; {_SCHEMA} COMMIT;")
+            self._connessione, self._pid = connessione, os.getpid()
+        return self._connessione
+
+    def chiudi(self):
+        if self._connessione is not None and self._pid == os.getpid():
+            self._connessione.close()
+        self._connessione = None
+
+    def istanti(self, tt):
+        """Giorni giuliani TT -> indici interi sulla griglia del livello."""
+        return np.rint(np.asarray(tt, dtype=float) * (86400.0 / self.passo)).astype(np.int64)
+
+    def tt(self, istanti):
+        """Indici della griglia -> giorni giuliani TT."""
+        return np.asarray(istanti, dtype=np.int64) * (self.passo / 86400.0)
+
+    def leggi(self, corpo, istanti):
+        """
+        Posizioni salvate per istanti distinti della griglia.
+
+        Returns:
+            tuple: (presenti, valori): maschera booleana e array (n, 3) di
+            longitudine, latitudine e velocità (NaN dove mancano).
+        """
+        istanti = np.asarray(istanti, dtype=np.int64)
+        valori = np.full((istanti.size, 3), np.nan)
+        righe = []
+        c = self.connessione
+        for i in range(0, istanti.size, _LOTTO):
+            lotto = istanti[i:i + _LOTTO].tolist()
+            righe += c.execute(
+                "SELECT istante, longitudine, latitudine, velocita, accesso FROM posizioni "
+                f"WHERE corpo = ? AND livello = ? AND istante IN ({','.join('?' * len(lotto))})",
+                [corpo, self.passo, *lotto],
+            ).fetchall()
+        if righe:
+            trovati = np.array(righe)
+            ordine = np.argsort(istanti)
+            posizione = ordine[np.searchsorted(istanti, trovati[:, 0].astype(np.int64), sorter=ordine)]
+            valori[posizione] = trovati[:, 1:4]
+
+            # Solo le righe non usate da più di RINNOVO_ACCESSO, in un'unica transazione
+            adesso = time.time()
+            vecchie = trovati[trovati[:, 4] < adesso - RINNOVO_ACCESSO, 0].astype(np.int64).tolist()
+            if vecchie:
+                with c:
+                    c.execute("BEGIN IMMEDIATE")
+                    c.executemany("UPDATE posizioni SET accesso = ? WHERE corpo = ? AND livello = ? AND istante = ?",
+                                  [(adesso, corpo, self.passo, istante) for istante in vecchie])
+        return ~np.isnan(valori[:, 0]), valori
+
+    def scrivi(self, corpo, istanti, valori):
+        """Salva le posizioni (n, 3) di un corpo e applica il limite di righe."""
+        adesso = time.time()
+        righe = [(corpo, self.passo, i, *v, adesso)
+                 for i, v in zip(np.asarray(istanti).tolist(), np.asarray(valori).tolist())]
+        with self.connessione as c:
+            c.execute("BEGIN IMMEDIATE")
+            # Le posizioni di una chiave non cambiano: se un altro processo l'ha già
+            # scritta si tiene la sua riga (REPLACE non aggiornerebbe il conteggio)
+            c.executemany("INSERT OR IGNORE INTO posizioni VALUES (?, ?, ?, ?, ?, ?, ?)", righe)
+        self._sfratta()
+
+    def righe(self):
+        (righe,) = self.connessione.execute("SELECT righe FROM conteggio WHERE id = 1").fetchone()
+        return righe
+
+    def _sfratta(self):
+        c = self.connessione
+        righe = self.righe()
+        if righe <= self.max_righe:
+            return
+        # Si scende al 90% del limite per non sfrattare a ogni scrittura
+        eccesso = righe - int(self.max_righe * 0.9)
+        with c:
+            c.execute("BEGIN IMMEDIATE")
+            c.execute("DELETE FROM posizioni WHERE (corpo, livello, istante) IN ("
+                      "SELECT corpo, livello, istante FROM posizioni ORDER BY accesso LIMIT ?)", (eccesso,))
+
+    def eclittiche(self, corpo, tt):
+        """
+        (longitudine, latitudine, velocità) di un corpo su array di istanti TT.
+
+        Ogni istante viene arrotondato alla griglia; gli istanti distinti assenti
+        dalla cache vengono calcolati con Skyfield in un'unica chiamata e salvati.
+        """
+        istanti = self.istanti(tt)
+        distinti, inversa = np.unique(istanti, return_inverse=True)
+        with PROFILO.fase("cache_lettura"):
+            presenti, valori = self.leggi(corpo, distinti)
+        trovati = int(presenti.sum())
+        self.trovati += trovati
+        self.mancanti += presenti.size - trovati
+        PROFILO.conta("cache_trovati", trovati)
+        PROFILO.conta("cache_mancanti", presenti.size - trovati)
+        if not presenti.all():
+            mancanti = distinti[~presenti]
+            calcolati = np.column_stack(eclittiche_esatte(corpo, scala_tempi().tt_jd(self.tt(mancanti))))
+            valori[~presenti] = calcolati
+            with PROFILO.fase("cache_scrittura"):
+                self.scrivi(corpo, mancanti, calcolati)
+        valori = valori[inversa.ravel()]
+        return valori[:, 0], valori[:, 1], valori[:, 2]
+
+    def riscalda(self, corpi, tt_inizio, tt_fine, blocco=50_000):
+        """Precalcola tutti gli istanti della griglia fra due date TT (estremi inclusi)."""
+        inizio, fine = self.istanti(tt_inizio), self.istanti(tt_fine)
+        for primo in range(int(inizio), int(fine) + 1, blocco):
+            istanti = np.arange(primo, min(primo + blocco, int(fine) + 1))
+            for corpo in corpi:
+                self.eclittiche(corpo, self.tt(istanti))
+
+    def tasso_successo(self):
+        richieste = self.trovati + self.mancanti
+        return self.trovati / richieste if richieste else float("nan")
+
+
+def _giorno_giuliano_tt(data):
+    return scala_tempi().utc(*map(int, data.split("-"))).tt
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prepara la cache delle posizioni per un intervallo di date.")
+    parser.add_argument("inizio", help="data iniziale (AAAA-MM-GG)")
+    parser.add_argument("fine", help="data finale (AAAA-MM-GG)")
+    parser.add_argument("--livello", choices=LIVELLI, default="media")
+    parser.add_argument("--corpi", nargs="+", choices=CORPI, default=list(CORPI))
+    parser.add_argument("--percorso", default=PERCORSO_PREDEFINITO)
+    parser.add_argument("--max-righe", type=int, default=5_000_000)
+    parser.add_argument("--profilo", nargs="?", const="testo", choices=["testo", "json", "prometheus"],
+                        help="stampa i tempi per fase (testo, json o prometheus)")
+    argomenti = parser.parse_args()
+    PROFILO.attiva(argomenti.profilo is not None)
+
+    cache = CachePosizioni(argomenti.percorso, argomenti.livello, argomenti.max_righe)
+    inizio = time.perf_counter()
+    cache.riscalda(argomenti.corpi, _giorno_giuliano_tt(argomenti.inizio), _giorno_giuliano_tt(argomenti.fine))
+    print(f"{cache.mancanti} posizioni calcolate, {cache.trovati} già presenti, "
+          f"in {time.perf_counter() - inizio:.1f} s")
+    if argomenti.profilo:
+        print()
+        print(PROFILO.esporta(argomenti.profilo))
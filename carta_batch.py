@@ -0,0 +1,318 @@
+import numpy as np
+
+from ayanamsa import in_siderale
+from domificazione import placidus_cuspidi_ramc
+from effemeridi import CORPI, posizioni_eclittiche
+from kernel_angoli import ascendente
+from profilazione import PROFILO
+
+# Obliquità media usata da domificazione.obliquita_eclittica
+OBLIQUITA = 23.4393
+
+ANGOLI = ("ASC", "DSC", "MC", "IC")
+PIANETI = tuple(CORPI)
+
+# Un record per carta: niente dizionari Python per singola carta
+DTYPE_CARTA = np.dtype([
+    ("jd", np.float64),
+    ("latitudine", np.float64),
+    ("longitudine", np.float64),
+    ("angoli", np.float64, (len(ANGOLI),)),        # ASC, DSC, MC, IC
+    ("cuspidi", np.float64, (12,)),                 # case 1-12
+    ("pianeti_lon", np.float64, (len(PIANETI),)),   # longitudine eclittica (gradi)
+    ("pianeti_lat", np.float64, (len(PIANETI),)),   # latitudine eclittica (gradi)
+    ("pianeti_vel", np.float64, (len(PIANETI),)),   # velocità in longitudine (gradi/giorno)
+])
+
+
+def equazione_equinozi(jd):
+    """
+    Equazione degli equinozi (tempo siderale apparente - medio) in gradi, su array.
+
+    Nutazione in longitudine con i quattro termini principali (Meeus, cap. 22):
+    lo scarto dal modello completo resta sotto 0.5", cioè 0.03 s di tempo.
+    """
+    T = (np.asarray(jd, dtype=float) - 2451545.0) / 36525.0
+    sole = np.radians(280.4665 + 36000.7698 * T)
+    luna = np.radians(218.3165 + 481267.8813 * T)
+    nodo = np.radians(125.04452 - 1934.136261 * T)
+    nutazione = (-17.20 * np.sin(nodo) - 1.32 * np.sin(2 * sole)
+                 - 0.23 * np.sin(2 * luna) + 0.21 * np.sin(2 * nodo)) / 3600.0
+    return nutazione * np.cos(np.radians(OBLIQUITA))
+
+
+def tempo_siderale_locale(jd, longitudine, apparente=True):
+    """
+    Tempo Siderale Locale in gradi, su array.
+
+    Il tempo medio usa la formula di legacy/advanced.py; quello apparente (default)
+    aggiunge `equazione_equinozi`, come `sidereal_time('apparent')` usato da
+    `domificazione.placidus_cuspide`. Senza, gli istanti di `rettifica` si
+    sposterebbero fino a ~1 s rispetto al calcolo scalare delle case.
+
+    Args:
+        jd (array): Giorno giuliano (UT).
+        longitudine (array): Longitudine in gradi (positiva a est).
+        apparente (bool): Se False restituisce il tempo siderale medio.
+
+    Returns:
+        array: LST in gradi (0-360°).
+    """
+    jd = np.asarray(jd, dtype=float)
+    T = (jd - 2451545.0) / 36525.0  # Secoli Giuliani dal J2000.0
+    GMST = 280.46061837 + 360.98564736629 * (jd - 2451545) + T**2 * 0.000387933 - T**3 / 38710000.0
+    if apparente:
+        GMST = GMST + equazione_equinozi(jd)
+    return (GMST % 360 + longitudine) % 360
+
+
+def punti_cardinali_batch(ora_siderale_locale, latitudine, obliquita=OBLIQUITA, backend="auto"):
+    """
+    Calcola ASC, DSC, MC e IC per array di istanti e luoghi.
+
+    L'Ascendente usa la formula di legacy/asc.calculate_ascendant (in
+    `kernel_angoli.ascendente`), che gestisce quadranti e latitudini polari;
+    il Medio Cielo usa la formula di legacy/advanced.calc_asc_mc.
+
+    Args:
+        ora_siderale_locale (array): Ore (0-24).
+        latitudine (array): Gradi decimali (Nord +, Sud -).
+        obliquita (array): Obliquità dell'eclittica in gradi.
+        backend (str): Backend dei kernel ("auto", "numba" o "numpy").
+
+    Returns:
+        dict: ASC, DSC, MC, IC come array in gradi zodiacali (0-360°).
+    """
+    ramc, latitudine, obliquita = np.broadcast_arrays(
+        np.asarray(ora_siderale_locale, dtype=float) * 15, latitudine, obliquita
+    )
+    epsilon = np.radians(obliquita)
+    ramc_rad = np.radians(ramc)
+
+    # x1 normalizzato: legacy/asc.py ricava il quadrante prima di normalizzare
+    asc = ascendente((ramc + 90) % 360, latitudine, np.sin(epsilon), np.cos(epsilon), backend=backend)
+    mc = np.degrees(np.arctan2(np.sin(ramc_rad), np.cos(ramc_rad) * np.cos(epsilon))) % 360
+
+    # Array anche per input scalari, così i chiamanti possono modificarli sul posto
+    angoli = {"ASC": asc, "DSC": (asc + 180) % 360, "MC": mc, "IC": (mc + 180) % 360}
+    return {nome: np.asarray(valori, dtype=float) for nome, valori in angoli.items()}
+
+
+def angoli_batch(jd, latitudine, longitudine, obliquita=OBLIQUITA, backend="auto", ayanamsa=None):
+    """
+    Come `punti_cardinali_batch`, ma a partire da giorno giuliano (UT) e longitudine.
+    Con `ayanamsa` (es. "lahiri") gli angoli sono nello zodiaco siderale.
+    """
+    lst = tempo_siderale_locale(jd, longitudine)
+    angoli = punti_cardinali_batch(lst / 15, latitudine, obliquita, backend=backend)
+    if ayanamsa is not None:
+        for valori in angoli.values():
+            in_siderale(valori, jd, ayanamsa)
+    return angoli
+
+
+def cuspidi_batch(jd, latitudine, longitudine, obliquita=OBLIQUITA, backend="auto", ayanamsa=None):
+    """
+    Angoli e cuspidi (case 1-12) per un array di istanti, senza costruire `Time`.
+
+    ASC e MC vengono da `punti_cardinali_batch`; le cuspidi 2, 3, 11 e 12 dal
+    risolutore di `domificazione.placidus_cuspidi_ramc`; le altre sono gli opposti.
+
+    Args:
+        jd (array): Giorni giuliani (UT).
+        latitudine (array): Latitudine in gradi.
+        longitudine (array): Longitudine in gradi (positiva a est).
+        obliquita (float): Obliquità dell'eclittica in gradi.
+        backend (str): Backend dei kernel degli angoli.
+        ayanamsa (str): Se dato (es. "lahiri"), cuspidi nello zodiaco siderale.
+
+    Returns:
+        array: Cuspidi in gradi (0-360°), forma (..., 12); NaN dove il risolutore fallisce.
+    """
+    with PROFILO.fase("tempo_siderale"):
+        lst = tempo_siderale_locale(jd, longitudine)
+    with PROFILO.fase("punti_cardinali"):
+        angoli = punti_cardinali_batch(lst / 15, latitudine, obliquita, backend=backend)
+    cuspidi = np.empty(np.shape(angoli["ASC"]) + (12,))
+    cuspidi[..., 0], cuspidi[..., 9] = angoli["ASC"], angoli["MC"]
+    with PROFILO.fase("cuspidi_placidus"):
+        for casa in (2, 3, 11, 12):
+            cuspidi[..., casa - 1] = placidus_cuspidi_ramc(casa, lst, latitudine, obliquita)
+    for casa, opposta in ((1, 7), (10, 4), (2, 8), (3, 9), (11, 5), (12, 6)):
+        cuspidi[..., opposta - 1] = (cuspidi[..., casa - 1] + 180) % 360
+    if ayanamsa is not None:
+        in_siderale(cuspidi, np.asarray(jd, dtype=float)[..., None], ayanamsa)
+    return cuspidi
+
+
+class Carta:
+    """
+    Vista leggera su una carta di un `CartaBatch`: non copia i dati.
+
+    Offre gli stessi formati delle funzioni scalari del repository
+    (`calcola_punti_cardinali`, `calcolare_cuspidi`, i pianeti di main.py).
+    """
+
+    __slots__ = ("_dati", "_indice")
+
+    def __init__(self, dati, indice):
+        self._dati = dati
+        self._indice = indice
+
+    def _campo(self, nome):
+        return self._dati[nome][self._indice]
+
+    @property
+    def jd(self):
+        return float(self._campo("jd"))
+
+    @property
+    def latitudine(self):
+        return float(self._campo("latitudine"))
+
+    @property
+    def longitudine(self):
+        return float(self._campo("longitudine"))
+
+    @property
+    def cuspidi(self):
+        """Cuspidi 1-12 come vista (array di 12 elementi)."""
+        return self._campo("cuspidi")
+
+    def punti_cardinali(self):
+        """Dizionario ASC, DSC, MC, IC come `axes.calcola_punti_cardinali`."""
+        return dict(zip(ANGOLI, self._campo("angoli").tolist()))
+
+    def case(self):
+        """Dizionario {casa: grado} come `domificazione.calcolare_cuspidi`."""
+        return dict(enumerate(self._campo("cuspidi").tolist(), start=1))
+
+    def pianeti(self):
+        """Dizionario {nome: longitudine eclittica} con i corpi di main.py."""
+        return dict(zip(PIANETI, self._campo("pianeti_lon").tolist()))
+
+    def __repr__(self):
+        asc, _, mc, _ = self._campo("angoli")
+        return f"Carta(jd={self.jd:.6f}, lat={self.latitudine:.4f}, lon={self.longitudine:.4f}, ASC={asc:.2f}, MC={mc:.2f})"
+
+
+class CartaBatch:
+    """
+    Insieme di carte in un unico array strutturato NumPy (`DTYPE_CARTA`).
+
+    Lo slicing (`batch[10:20]`) restituisce una vista senza copie; l'indicizzazione
+    con un intero restituisce una `Carta`; con maschere o indici restituisce un
+    nuovo batch (NumPy deve copiare le righe scelte).
+    """
+
+    __slots__ = ("dati",)
+
+    def __init__(self, dati):
+        if dati.dtype != DTYPE_CARTA:
+            raise TypeError("CartaBatch richiede un array con dtype DTYPE_CARTA")
+        self.dati = dati
+
+    @classmethod
+    def vuoto(cls, n):
+        dati = np.zeros(n, dtype=DTYPE_CARTA)
+        dati[["angoli", "cuspidi", "pianeti_lon", "pianeti_lat", "pianeti_vel"]] = np.nan
+        return cls(dati)
+
+    @classmethod
+    def calcola(cls, jd, latitudine, longitudine, obliquita=OBLIQUITA, pianeti=True, backend="auto",
+                ayanamsa=None):
+        """
+        Calcola angoli, cuspidi e (opzionalmente) pianeti per array di carte.
+
+        Args:
+            jd (array): Giorni giuliani (UT).
+            latitudine (array): Latitudini in gradi.
+            longitudine (array): Longitudini in gradi (positive a est).
+            obliquita (float): Obliquità dell'eclittica in gradi.
+            pianeti (bool): Se False lascia a NaN i campi dei pianeti.
+            backend (str): Backend dei kernel degli angoli.
+            ayanamsa (str): Se dato (es. "lahiri"), longitudini nello zodiaco siderale.
+
+        Returns:
+            CartaBatch: Una carta per elemento del broadcast degli argomenti (appiattito).
+        """
+        jd, latitudine, longitudine = (np.ravel(a) for a in np.broadcast_arrays(
+            np.asarray(jd, dtype=float), np.asarray(latitudine, dtype=float),
+            np.asarray(longitudine, dtype=float)))
+        batch = cls.vuoto(jd.size)
+        dati = batch.dati
+        dati["jd"], dati["latitudine"], dati["longitudine"] = jd, latitudine, longitudine
+        dati["cuspidi"] = cuspidi_batch(jd, latitudine, longitudine, obliquita, backend=backend,
+                                        ayanamsa=ayanamsa)
+        dati["angoli"] = dati["cuspidi"][:, [0, 6, 9, 3]]  # case 1, 7, 10, 4
+        if pianeti:
+            lon, lat, vel = posizioni_eclittiche(PIANETI, jd, ayanamsa=ayanamsa)
+            dati["pianeti_lon"], dati["pianeti_lat"], dati["pianeti_vel"] = lon.T, lat.T, vel.T
+        return batch
+
+    def __len__(self):
+        return self.dati.shape[0]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, (int, np.integer)):
+            if not -len(self) <= indice < len(self):
+                raise IndexError(indice)
+            return Carta(self.dati, int(indice) % len(self))
+        return CartaBatch(self.dati[indice])
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield Carta(self.dati, indice)
+
+    def filtra(self, maschera):
+        """Carte che soddisfano una maschera booleana (es. `batch.colonna("ASC") < 30`)."""
+        return CartaBatch(self.dati[np.asarray(maschera, dtype=bool)])
+
+    def colonna(self, nome):
+        """
+        Vista (senza copia) su una colonna: un campo di `DTYPE_CARTA`, un angolo
+        ("ASC", ...), una casa ("Casa 1"...) o un pianeta ("Sole", ...).
+        """
+        if nome in ANGOLI:
+            return self.dati["angoli"][:, ANGOLI.index(nome)]
+        if nome in PIANETI:
+            return self.dati["pianeti_lon"][:, PIANETI.index(nome)]
+        if nome.startswith("Casa "):
+            return self.dati["cuspidi"][:, int(nome[5:]) - 1]
+        return self.dati[nome]
+
+    def colonne(self):
+        """Dizionario nome -> vista di ogni colonna scalare, pronto per pandas/Arrow."""
+        colonne = {nome: self.dati[nome] for nome in ("jd", "latitudine", "longitudine")}
+        colonne.update({nome: self.colonna(nome) for nome in ANGOLI})
+        colonne.update({f"Casa {casa}": self.colonna(f"Casa {casa}") for casa in range(1, 13)})
+        for campo, suffisso in (("pianeti_lon", "lon"), ("pianeti_lat", "lat"), ("pianeti_vel", "vel")):
+            colonne.update({f"{nome}_{suffisso}": self.dati[campo][:, k] for k, nome in enumerate(PIANETI)})
+        return colonne
+
+    def salva(self, percorso):
+        """Salva il batch in formato .npy (l'array strutturato così com'è)."""
+        np.save(percorso, self.dati, allow_pickle=False)
+
+    @classmethod
+    def carica(cls, percorso, mmap=False):
+        """Carica un batch salvato con `salva`; con `mmap=True` senza leggerlo in memoria."""
+        return cls(np.load(percorso, mmap_mode="r" if mmap else None, allow_pickle=False))
+
+    def esporta_csv(self, percorso):
+        """Esporta il batch in CSV, una riga per carta."""
+        colonne = self.colonne()
+        np.savetxt(percorso, np.column_stack(list(colonne.values())), delimiter=",",
+                   header=",".join(colonne), comments="", fmt="%.10g")
+
+    def __repr__(self):
+        return f"CartaBatch({len(self)} carte)"
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    # Montichiari, 10 giugno 1993 ore 10:15 UTC, e lo stesso istante ogni ora per un giorno
+    jd = 2449148.927083 + np.arange(24) / 24
+    angoli = angoli_batch(jd, 45.41317, 10.39799)
+    for ora, (asc, mc) in enumerate(zip(angoli["ASC"], angoli["MC"])):
+        print(f"+{ora:2d}h  ASC: {asc:7.2f}°  MC: {mc:7.2f}°")
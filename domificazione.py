@@ -5,11 +5,15 @@ from astropy.coordinates import get_sun
 import astropy.units as u
 from scipy.optimize import root_scalar
 
+from profilazione import PROFILO
+
 
 def calcolare_tempo_siderale(data_ora, latitudine, longitudine):
-    t = Time(data_ora)
+    with PROFILO.fase("tempo"):
+        t = Time(data_ora)
     location = EarthLocation(lat=latitudine * u.deg, lon=longitudine * u.deg)
-    return t.sidereal_time('apparent', longitude=location.lon).deg
+    with PROFILO.fase("tempo_siderale"):
+        return t.sidereal_time('apparent', longitude=location.lon).deg
 
 
 def obliquita_eclittica(data_ora):
@@ -44,12 +48,18 @@ def medium_coeli(t, latitudine, longitudine):
     return mc_deg
 
 
+def _equazione_placidus(H, th, sgn, epsilon, phi):
+    return np.tan(th + sgn * H / 3) * np.cos(epsilon) - np.tan(phi) * np.sin(H)
+
+
 def placidus_cuspide(casa_num, t, latitudine, longitudine, metodo="bisezione"):
     location = EarthLocation(lat=latitudine * u.deg, lon=longitudine * u.deg)
-    tempo = Time(t)
+    with PROFILO.fase("tempo"):
+        tempo = Time(t)
     epsilon = np.deg2rad(obliquita_eclittica(t))
     phi = np.deg2rad(latitudine)
-    lst = tempo.sidereal_time('apparent', longitude=location.lon).deg
+    with PROFILO.fase("tempo_siderale"):
+        lst = tempo.sidereal_time('apparent', longitude=location.lon).deg
 
     # Convertiamo lst in radianti
     th = np.deg2rad(lst)
@@ -66,13 +76,20 @@ def placidus_cuspide(casa_num, t, latitudine, longitudine, metodo="bisezione"):
 
     def equazione(H):
         try:
-            return np.tan(th + sgn * H / 3) * np.cos(epsilon) - np.tan(phi) * np.sin(H)
+            return _equazione_placidus(H, th, sgn, epsilon, phi)
         except:
             return 1e6  # fallback se diverge
 
-    sol = root_scalar(equazione, bracket=[-np.pi/2 + 0.01, np.pi/2 - 0.01], method='bisect' if metodo=="bisezione" else "newton", xtol=1e-6)
+    with PROFILO.fase("root_scalar"):
+        try:
+            sol = root_scalar(equazione, bracket=[-np.pi/2 + 0.01, np.pi/2 - 0.01], method='bisect' if metodo=="bisezione" else "newton", xtol=1e-6)
+        except ValueError:  # nessun cambio di segno nell'intervallo
+            PROFILO.conta("root_scalar_fallimenti")
+            raise
+    PROFILO.conta("root_scalar_iterazioni", sol.iterations)
 
     if not sol.converged:
+        PROFILO.conta("root_scalar_fallimenti")
         return None
 
     H = sol.root
@@ -81,6 +98,62 @@ def placidus_cuspide(casa_num, t, latitudine, longitudine, metodo="bisezione"):
     return cuspide
 
 
+def placidus_cuspidi_ramc(casa_num, ramc, latitudine, obliquita=None, xtol=1e-6):
+    """
+    Versione vettoriale di `placidus_cuspide` in funzione di RAMC e latitudine.
+
+    Risolve la stessa equazione con una bisezione su array, senza passare da
+    `Time`/`sidereal_time`: tutti gli elementi vengono dimezzati insieme.
+
+    Args:
+        casa_num (int): Casa da calcolare (2, 3, 11 o 12).
+        ramc (array): Ascensione retta del Medio Cielo in gradi.
+        latitudine (array): Latitudine in gradi (broadcast con `ramc`).
+        obliquita (float | array): Obliquità in gradi (default come `obliquita_eclittica`).
+        xtol (float): Tolleranza sull'angolo orario in radianti.
+
+    Returns:
+        array: Cuspide in gradi (0-360°), NaN dove l'intervallo non contiene radici.
+    """
+    if casa_num in [2, 3]:
+        sgn = -1
+    elif casa_num in [11, 12]:
+        sgn = 1
+    else:
+        raise ValueError(f"Casa {casa_num} non calcolabile con Placidus (solo 2, 3, 11, 12)")
+
+    if obliquita is None:
+        obliquita = obliquita_eclittica(None)
+    ramc = np.asarray(ramc, dtype=float)
+    th = np.deg2rad(ramc)
+    phi = np.deg2rad(np.asarray(latitudine, dtype=float))
+    epsilon = np.deg2rad(obliquita)
+    th, phi, epsilon = np.broadcast_arrays(th, phi, epsilon)
+
+    a = np.full(th.shape, -np.pi/2 + 0.01)
+    b = np.full(th.shape, np.pi/2 - 0.01)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fa = _equazione_placidus(a, th, sgn, epsilon, phi)
+        fb = _equazione_placidus(b, th, sgn, epsilon, phi)
+        valida = np.sign(fa) * np.sign(fb) <= 0
+
+        n_iter = int(np.ceil(np.log2((b.flat[0] - a.flat[0]) / xtol))) if a.size else 0
+        for _ in range(n_iter):
+            m = 0.5 * (a + b)
+            fm = _equazione_placidus(m, th, sgn, epsilon, phi)
+            sinistra = np.sign(fa) * np.sign(fm) <= 0
+            b = np.where(sinistra, m, b)
+            a = np.where(sinistra, a, m)
+            fa = np.where(sinistra, fa, fm)
+
+    if PROFILO.attivo:
+        PROFILO.conta("bisezione_iterazioni", n_iter * th.size)
+        PROFILO.conta("bisezione_fallimenti", np.count_nonzero(~valida))
+    H = 0.5 * (a + b)
+    cuspide = (np.rad2deg(th) + np.rad2deg(H)) % 360
+    return np.where(valida, cuspide, np.nan)
+
+
 def calcolare_cuspidi(asc, mc, t, latitudine, longitudine):
     cuspidi = {
         1: asc,
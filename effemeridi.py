@@ -0,0 +1,138 @@
+from functools import lru_cache
+
+import numpy as np
+from skyfield.api import load
+from skyfield.framelib import ecliptic_frame
+
+from ayanamsa import in_siderale
+from profilazione import PROFILO
+
+# Effemeridi della NASA usate da main.py
+FILE_EFFEMERIDI = 'de421.bsp'
+
+# Nome del corpo -> bersaglio nelle effemeridi (stesso elenco di main.py)
+CORPI = {
+    "Sole": 'sun',
+    "Luna": 'moon',
+    "Mercurio": 'mercury',
+    "Venere": 'venus',
+    "Marte": 'mars',
+    "Giove": 'jupiter barycenter',
+    "Saturno": 'saturn barycenter',
+    "Urano": 'uranus barycenter',
+    "Nettuno": 'neptune barycenter',
+    "Plutone": 'pluto barycenter',
+}
+
+
+# Corpo -> traccia interpolata (es. traccia_luna.TracciaLuna) usata da posizioni_eclittiche
+_TRACCE = {}
+
+
+def registra_traccia(traccia):
+    """Serve `traccia.nome` da `traccia` in `posizioni_eclittiche`, dove la traccia copre gli istanti."""
+    _TRACCE[traccia.nome] = traccia
+
+
+def rimuovi_traccia(nome):
+    _TRACCE.pop(nome, None)
+
+
+@lru_cache(maxsize=None)
+def carica_effemeridi(percorso=FILE_EFFEMERIDI):
+    """Carica (una sola volta per processo) il file di effemeridi."""
+    return load(percorso)
+
+
+@lru_cache(maxsize=None)
+def scala_tempi():
+    return load.timescale()
+
+
+def tempi(jd):
+    """Costruisce un unico `Time` di Skyfield per un array di giorni giuliani (UT)."""
+    with PROFILO.fase("tempo"):
+        return scala_tempi().ut1_jd(np.asarray(jd, dtype=float))
+
+
+def posizione_apparente(nome, t):
+    """Posizione apparente geocentrica (Skyfield `Apparent`) di un corpo per un `Time`."""
+    eph = carica_effemeridi()
+    with PROFILO.fase("osserva_apparente"):
+        return eph['earth'].at(t).observe(eph[CORPI[nome]]).apparent()
+
+
+def eclittiche_esatte(nome, t):
+    """
+    Longitudine, latitudine (eclittica della data) e velocità in longitudine di
+    un corpo, calcolate con Skyfield per un `Time` (anche vettoriale).
+
+    Returns:
+        tuple: (longitudine, latitudine, velocita) in gradi, gradi e gradi/giorno.
+    """
+    posizione = posizione_apparente(nome, t)
+    with PROFILO.fase("coordinate_eclittiche"):
+        b, l, _, _, dl, _ = posizione.frame_latlon_and_rates(ecliptic_frame)
+    return l.degrees, b.degrees, dl.degrees.per_day
+
+
+def posizioni_equatoriali(nomi, jd):
+    """
+    Ascensione retta e declinazione apparenti (equinozio della data) su array di istanti.
+
+    Args:
+        nomi (list): Nomi dei corpi (chiavi di `CORPI`).
+        jd (array): Giorni giuliani (UT).
+
+    Returns:
+        tuple: (ra, dec, distanza) in gradi, gradi e km, con forma (len(nomi), *jd.shape).
+    """
+    jd = np.asarray(jd, dtype=float)
+    t = tempi(jd.ravel())
+    ra, dec, distanza = (np.empty((len(nomi), jd.size)) for _ in range(3))
+    for k, nome in enumerate(nomi):
+        a, d, r = posizione_apparente(nome, t).radec(epoch='date')
+        ra[k], dec[k], distanza[k] = a.degrees, d.degrees, r.km
+    forma = (len(nomi),) + jd.shape
+    return ra.reshape(forma), dec.reshape(forma), distanza.reshape(forma)
+
+
+def posizioni_eclittiche(nomi, jd, ayanamsa=None, cache=None):
+    """
+    Longitudine e latitudine eclittiche apparenti (eclittica della data), con velocità.
+
+    A differenza di main.py, che usa `ecliptic_latlon()` (eclittica J2000), qui
+    le longitudini sono riferite all'equinozio della data, come in astrologia.
+    I corpi con una traccia registrata (`registra_traccia`) che copre tutti gli
+    istanti vengono interpolati dalla traccia invece che calcolati.
+
+    Args:
+        nomi (list): Nomi dei corpi (chiavi di `CORPI`).
+        jd (array): Giorni giuliani (UT).
+        ayanamsa (str): Se dato (es. "lahiri"), longitudini nello zodiaco siderale.
+        cache (cache_posizioni.CachePosizioni): Se data, le posizioni vengono lette
+            (o calcolate e salvate) sulla griglia di istanti TT del suo livello.
+
+    Returns:
+        tuple: (longitudine, latitudine, velocita) in gradi, gradi e gradi/giorno,
+        con forma (len(nomi), *jd.shape).
+    """
+    jd = np.asarray(jd, dtype=float)
+    lon, lat, vel = (np.empty((len(nomi), jd.size)) for _ in range(3))
+    t = None
+    for k, nome in enumerate(nomi):
+        traccia = _TRACCE.get(nome)
+        if traccia is not None and traccia.copre(jd):
+            with PROFILO.fase("traccia"):
+                lon[k], lat[k], vel[k], _ = traccia.valuta(jd.ravel())
+            continue
+        if t is None:
+            t = tempi(jd.ravel())
+        if cache is None:
+            lon[k], lat[k], vel[k] = eclittiche_esatte(nome, t)
+        else:
+            lon[k], lat[k], vel[k] = cache.eclittiche(nome, t.tt)
+    if ayanamsa is not None:
+        in_siderale(lon, jd.ravel(), ayanamsa)
+    forma = (len(nomi),) + jd.shape
+    return lon.reshape(forma), lat.reshape(forma), vel.reshape(forma)
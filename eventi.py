@@ -0,0 +1,172 @@
+import numpy as np
+
+from carta_batch import tempo_siderale_locale
+from effemeridi import posizioni_equatoriali
+from orizzonte import coordinate_orizzontali
+
+# Tipi di evento
+SORGERE = 0
+TRAMONTARE = 1
+CULMINAZIONE_SUPERIORE = 2
+CULMINAZIONE_INFERIORE = 3
+
+NOMI_EVENTI = {
+    SORGERE: "sorgere",
+    TRAMONTARE: "tramonto",
+    CULMINAZIONE_SUPERIORE: "culminazione superiore",
+    CULMINAZIONE_INFERIORE: "culminazione inferiore",
+}
+
+# Altitudine geocentrica del centro del corpo al sorgere/tramonto (gradi):
+# rifrazione standard (34') più semidiametro per il Sole, più parallasse per la Luna.
+# La parallasse lunare è presa costante: il sorgere della Luna può differire di
+# ~17 s da quello topocentrico di Skyfield (almanac.risings_and_settings con
+# radius_degrees=0.26, Roma, 30 giorni); Sole e pianeti restano entro ~1.5 s.
+ALTITUDINE_ORIZZONTE = {
+    "Sole": -0.8333,
+    "Luna": 0.125,
+}
+ALTITUDINE_ORIZZONTE_PIANETI = -0.5667
+
+DTYPE_EVENTO = np.dtype([
+    ("corpo", np.int16),   # indice in `nomi`
+    ("sito", np.int32),    # indice in `latitudini`/`longitudini`
+    ("tipo", np.int8),     # SORGERE, TRAMONTARE, CULMINAZIONE_*
+    ("jd", np.float64),    # istante dell'evento (UT)
+])
+
+
+def _angolo_relativo(angolo):
+    """Porta un angolo in [-180°, 180°)."""
+    return (angolo + 180.0) % 360.0 - 180.0
+
+
+def _attraversamenti(f, continuo):
+    """Indici (k, sito) dove `f` passa da negativo a non negativo, e viceversa."""
+    prima, dopo = f[:-1], f[1:]
+    salita = (prima < 0) & (dopo >= 0) & continuo
+    discesa = (prima >= 0) & (dopo < 0) & continuo
+    return np.nonzero(salita), np.nonzero(discesa)
+
+
+def _raffina(funzione, k, sito, jd, iterazioni):
+    """Bisezione vettoriale di `funzione(k, sito, t)` su tutti gli intervalli [jd[k], jd[k+1]]."""
+    a, b = jd[k], jd[k + 1]
+    fa = funzione(k, sito, a)
+    for _ in range(iterazioni):
+        m = 0.5 * (a + b)
+        fm = funzione(k, sito, m)
+        sinistra = np.sign(fa) * np.sign(fm) <= 0
+        b = np.where(sinistra, m, b)
+        a = np.where(sinistra, a, m)
+        fa = np.where(sinistra, fa, fm)
+    return 0.5 * (a + b)
+
+
+def trova_eventi(nomi, jd_inizio, jd_fine, latitudini, longitudini, passo=10 / 1440,
+                 altitudine_orizzonte=None, blocco_siti=64, iterazioni=20):
+    """
+    Trova sorgere, tramonto e culminazioni dei corpi per un intervallo di date e più siti.
+
+    Le posizioni vengono calcolate una sola volta su una griglia a passo `passo`;
+    per ogni corpo e blocco di siti si campiona l'altitudine, si individuano gli
+    intervalli con cambio di segno e li si raffina tutti insieme per bisezione,
+    interpolando linearmente RA e Dec all'interno dell'intervallo.
+
+    Args:
+        nomi (list): Nomi dei corpi (chiavi di `effemeridi.CORPI`).
+        jd_inizio (float): Inizio dell'intervallo (giorno giuliano UT).
+        jd_fine (float): Fine dell'intervallo (giorno giuliano UT).
+        latitudini (array): Latitudini dei siti in gradi.
+        longitudini (array): Longitudini dei siti in gradi (positive a est).
+        passo (float): Passo di campionamento in giorni (default 10 minuti).
+        altitudine_orizzonte (float | dict): Altitudine dell'orizzonte in gradi, unica
+            o per corpo; di default (e per i corpi assenti dal dizionario)
+            `ALTITUDINE_ORIZZONTE`.
+        blocco_siti (int): Numero di siti elaborati insieme (limita la memoria).
+        iterazioni (int): Passi di bisezione (20 con passo di 10 minuti ≈ 0.001 s).
+
+    Returns:
+        np.ndarray: Array strutturato `DTYPE_EVENTO`, ordinato per sito, corpo e istante.
+    """
+    latitudini = np.atleast_1d(np.asarray(latitudini, dtype=float))
+    longitudini = np.atleast_1d(np.asarray(longitudini, dtype=float))
+    n = int(np.ceil((jd_fine - jd_inizio) / passo)) + 1
+    jd = jd_inizio + np.arange(n) * passo
+
+    ra, dec, _ = posizioni_equatoriali(nomi, jd)
+    ra = np.degrees(np.unwrap(np.radians(ra), axis=-1))  # RA continua, per interpolare
+
+    risultati = []
+    for c, nome in enumerate(nomi):
+        if altitudine_orizzonte is None:
+            h0 = ALTITUDINE_ORIZZONTE.get(nome, ALTITUDINE_ORIZZONTE_PIANETI)
+        elif isinstance(altitudine_orizzonte, dict):
+            h0 = altitudine_orizzonte.get(nome, ALTITUDINE_ORIZZONTE.get(nome, ALTITUDINE_ORIZZONTE_PIANETI))
+        else:
+            h0 = altitudine_orizzonte
+
+        for inizio in range(0, latitudini.size, blocco_siti):
+            lat = latitudini[inizio:inizio + blocco_siti]
+            lon = longitudini[inizio:inizio + blocco_siti]
+
+            lst = tempo_siderale_locale(jd[:, None], lon[None, :])
+            ha = _angolo_relativo(lst - ra[c][:, None])
+            alt, _ = coordinate_orizzontali(ra[c][:, None], dec[c][:, None], lst, lat[None, :])
+
+            def angolo_orario(k, s, t):
+                frazione = (t - jd[k]) / passo
+                ra_t = ra[c, k] + frazione * (ra[c, k + 1] - ra[c, k])
+                return _angolo_relativo(tempo_siderale_locale(t, lon[s]) - ra_t), frazione
+
+            def altitudine(k, s, t):
+                h, frazione = angolo_orario(k, s, t)
+                dec_t = dec[c, k] + frazione * (dec[c, k + 1] - dec[c, k])
+                a, _ = coordinate_orizzontali(0.0, dec_t, h, lat[s])
+                return a - h0
+
+            def culminazione_superiore(k, s, t):
+                return angolo_orario(k, s, t)[0]
+
+            def culminazione_inferiore(k, s, t):
+                return _angolo_relativo(angolo_orario(k, s, t)[0] - 180.0)
+
+            sempre = np.ones((n - 1, lat.size), dtype=bool)
+            sorgere, tramonto = _attraversamenti(alt - h0, sempre)
+            superiore, _ = _attraversamenti(ha, np.abs(np.diff(ha, axis=0)) < 180.0)
+            ha_inf = _angolo_relativo(ha - 180.0)
+            inferiore, _ = _attraversamenti(ha_inf, np.abs(np.diff(ha_inf, axis=0)) < 180.0)
+
+            for tipo, (k, s), funzione in (
+                (SORGERE, sorgere, altitudine),
+                (TRAMONTARE, tramonto, altitudine),
+                (CULMINAZIONE_SUPERIORE, superiore, culminazione_superiore),
+                (CULMINAZIONE_INFERIORE, inferiore, culminazione_inferiore),
+            ):
+                eventi = np.empty(k.size, dtype=DTYPE_EVENTO)
+                eventi["corpo"] = c
+                eventi["sito"] = inizio + s
+                eventi["tipo"] = tipo
+                eventi["jd"] = _raffina(funzione, k, s, jd, iterazioni)
+                risultati.append(eventi)
+
+    eventi = np.concatenate(risultati) if risultati else np.empty(0, dtype=DTYPE_EVENTO)
+    return eventi[np.lexsort((eventi["jd"], eventi["corpo"], eventi["sito"]))]
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    from astropy.time import Time
+
+    # Roma e New Delhi, prima settimana di gennaio 2025
+    citta = ["Roma", "New Delhi"]
+    latitudini = [41.9, 28.6139]
+    longitudini = [12.5, 77.2090]
+    nomi = ["Sole", "Luna"]
+    inizio = Time("2025-01-01 00:00:00").jd
+
+    eventi = trova_eventi(nomi, inizio, inizio + 7, latitudini, longitudini)
+    for evento in eventi:
+        istante = Time(evento["jd"], format="jd").iso
+        print(f"{citta[evento['sito']]:10s} {nomi[evento['corpo']]:5s} "
+              f"{NOMI_EVENTI[int(evento['tipo'])]:23s} {istante} UTC")
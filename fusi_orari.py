@@ -0,0 +1,103 @@
+from functools import lru_cache
+
+import numpy as np
+import pytz
+
+# Inizio della prima regola di pytz (datetime(1, 1, 1)): in pratica -infinito
+_INIZIO = np.iinfo(np.int64).min // 4
+_EPOCA_JD = 2440587.5  # giorno giuliano di 1970-01-01 00:00 UTC
+
+
+@lru_cache(maxsize=None)
+def tabella_transizioni(zona):
+    """
+    Compila le regole di una zona IANA in array ordinati (una sola volta per zona).
+
+    Args:
+        zona (str): Nome IANA, ad esempio "Europe/Rome".
+
+    Returns:
+        tuple: (inizio_locale, fine_locale, offset) in secondi dall'epoca Unix,
+        un elemento per periodo con offset costante. Le regole di pytz arrivano
+        fino al 2037; dopo vale l'ultimo offset.
+    """
+    tz = pytz.timezone(zona)
+    if not hasattr(tz, "_utc_transition_times"):  # zona a offset fisso (UTC, Etc/GMT+5, ...)
+        offset = np.array([int(tz.utcoffset(None).total_seconds())])
+        return np.array([_INIZIO]), np.array([np.iinfo(np.int64).max]), offset
+
+    transizioni = np.array(tz._utc_transition_times[1:], dtype="datetime64[s]").astype(np.int64)
+    transizioni = np.concatenate([[_INIZIO], transizioni])
+    offset = np.array([int(info[0].total_seconds()) for info in tz._transition_info])
+
+    inizio_locale = transizioni + offset
+    fine_locale = np.append(transizioni[1:] + offset[:-1], np.iinfo(np.int64).max)
+    return inizio_locale, fine_locale, offset
+
+
+def _converti_zona(locale, zona, prima_occorrenza):
+    inizio_locale, fine_locale, offset = tabella_transizioni(zona)
+    i = np.maximum(np.searchsorted(inizio_locale, locale, side="right") - 1, 0)
+    inesistente = locale >= fine_locale[i]
+    precedente = np.maximum(i - 1, 0)
+    ambiguo = (i > 0) & ~inesistente & (locale < fine_locale[precedente])
+    if prima_occorrenza:
+        i = np.where(ambiguo, precedente, i)
+    # Ora inesistente (salto in avanti): si usa l'offset in vigore prima del salto
+    return locale - offset[i], offset[i], ambiguo, inesistente
+
+
+def locale_a_utc(locali, zone, prima_occorrenza=True):
+    """
+    Converte date/ore civili locali in UTC, su array, con regole storiche IANA.
+
+    Ogni zona viene compilata una volta (`tabella_transizioni`); l'offset di ogni
+    riga si trova con una ricerca binaria vettoriale.
+
+    Args:
+        locali (array): Date/ore locali (datetime64, datetime o stringhe ISO).
+        zone (array | str): Nome IANA per ogni riga, o uno solo per tutte.
+        prima_occorrenza (bool): Per le ore ambigue (ritorno all'ora solare) sceglie
+            la prima occorrenza (ora legale) se True, la seconda se False.
+
+    Returns:
+        tuple: (utc, offset, ambiguo, inesistente): istanti UTC (datetime64[s]),
+        offset applicato in secondi e i flag delle ore ambigue e di quelle che
+        non esistono (saltate dal passaggio all'ora legale).
+    """
+    locali = np.asarray(locali, dtype="datetime64[s]")
+    secondi = locali.astype(np.int64)
+    zone = np.broadcast_to(np.asarray(zone), locali.shape)
+
+    utc = np.empty(locali.shape, dtype=np.int64)
+    offset = np.empty(locali.shape, dtype=np.int64)
+    ambiguo = np.zeros(locali.shape, dtype=bool)
+    inesistente = np.zeros(locali.shape, dtype=bool)
+
+    nomi, gruppo = np.unique(zone, return_inverse=True)
+    gruppo = gruppo.reshape(locali.shape)
+    for k, zona in enumerate(nomi):
+        righe = gruppo == k
+        utc[righe], offset[righe], ambiguo[righe], inesistente[righe] = _converti_zona(
+            secondi[righe], str(zona), prima_occorrenza
+        )
+    return utc.astype("datetime64[s]"), offset, ambiguo, inesistente
+
+
+def giorno_giuliano(utc):
+    """Giorno giuliano (UTC) di un array di datetime64, per le API batch."""
+    return np.asarray(utc, dtype="datetime64[s]").astype(np.int64) / 86400.0 + _EPOCA_JD
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    # legacy/advanced.py e legacy/advanced_v2.py usano fuso 1 e fuso 2 per la stessa data:
+    # il 10 giugno 1993 in Italia era in vigore l'ora legale (UTC+2).
+    locali = np.array(["1993-06-10T12:15", "1993-01-10T12:15", "2024-03-31T02:30",
+                       "2024-10-27T02:30", "2025-04-11T12:00"], dtype="datetime64[s]")
+    zone = ["Europe/Rome", "Europe/Rome", "Europe/Rome", "Europe/Rome", "Asia/Kolkata"]
+    utc, offset, ambiguo, inesistente = locale_a_utc(locali, zone)
+    for riga in zip(locali, zone, utc, offset, ambiguo, inesistente):
+        locale, zona, istante, secondi, amb, ines = riga
+        note = " (ambigua)" if amb else " (inesistente)" if ines else ""
+        print(f"{locale} {zona:13s} → {istante} UTC, offset {secondi / 3600:+.1f} h{note}")
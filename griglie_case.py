@@ -0,0 +1,242 @@
+import numpy as np
+
+from domificazione import obliquita_eclittica, placidus_cuspidi_ramc
+
+
+def _cuspidi_placidus(ramc, latitudine, obliquita):
+    return np.stack(
+        [placidus_cuspidi_ramc(casa, ramc, latitudine, obliquita) for casa in (2, 3, 11, 12)],
+        axis=-1,
+    )
+
+
+# Sistema -> (case contenute nella griglia, risolutore esatto vettoriale)
+SISTEMI_CASE = {
+    "placidus": ((2, 3, 11, 12), _cuspidi_placidus),
+}
+
+VERSIONE_FORMATO = 2
+
+# Punti di controllo per lato di cella usati per il limite d'errore
+CAMPIONI_PER_LATO = 6
+# Margine applicato al massimo misurato sui punti di controllo
+FATTORE_SICUREZZA = 2.0
+# Rumore sempre presente (gradi): tolleranza del risolutore (1e-6 rad ≈ 6e-5°)
+# più l'arrotondamento a float32 dei nodi (3e-5° vicino a 360°)
+ERRORE_MINIMO = 1e-4
+# Salto fra nodi adiacenti (gradi) oltre il quale si assume un cambio di ramo
+SALTO_MASSIMO = 30.0
+
+# Nodi usati da ogni metodo, come scostamenti dal nodo in basso a sinistra della cella
+STENCIL = {
+    "bilineare": (0, 1),
+    "bicubica": (-1, 0, 1, 2),
+}
+
+
+def _scarto(valori, riferimento):
+    """Porta `valori` entro ±180° da `riferimento`, per interpolare attraverso 0°/360°."""
+    return riferimento + (valori - riferimento + 180.0) % 360.0 - 180.0
+
+
+def _stencil_instabile(valori, scostamenti):
+    """
+    Celle (n_lat - 1, n_ramc) il cui stencil non permette un'interpolazione affidabile:
+    una cuspide presente solo in alcuni nodi, o un salto di ramo fra nodi adiacenti.
+    """
+    n_lat, n_ramc, _ = valori.shape
+    j, i = np.arange(n_lat - 1)[:, None], np.arange(n_ramc)[None, :]
+    nodi = np.stack([
+        np.stack([valori[np.clip(j + dj, 0, n_lat - 1), (i + di) % n_ramc] for di in scostamenti])
+        for dj in scostamenti
+    ])  # (lato, lato, n_lat - 1, n_ramc, n_case)
+    nan = np.isnan(nodi)
+    misto = (nan.any(axis=(0, 1)) & ~nan.all(axis=(0, 1))).any(axis=-1)
+    with np.errstate(invalid="ignore"):
+        salto = np.zeros(misto.shape, dtype=bool)
+        for asse in (0, 1):
+            differenze = np.abs((np.diff(nodi, axis=asse) + 180.0) % 360.0 - 180.0)
+            salto |= (differenze > SALTO_MASSIMO).any(axis=(0, 1, -1))
+    return misto | salto
+
+
+def _catmull_rom(p0, p1, p2, p3, t):
+    t = t[..., None]
+    return p1 + 0.5 * t * (p2 - p0 + t * (2*p0 - 5*p1 + 4*p2 - p3 + t * (3*(p1 - p2) + p3 - p0)))
+
+
+class GrigliaCase:
+    """
+    Griglia (RAMC, latitudine) delle cuspidi di un sistema di case, a obliquità fissa.
+
+    I nodi sono calcolati con il risolutore esatto. Per ogni cella viene salvato
+    anche un limite empirico dell'errore di interpolazione (in gradi): il massimo
+    scarto dal risolutore esatto su CAMPIONI_PER_LATO² punti della cella,
+    moltiplicato per FATTORE_SICUREZZA, più ERRORE_MINIMO. Non è un limite
+    dimostrato: una radice che compare e scompare fra due punti di controllo può
+    sfuggire. Il limite è infinito se lo stencil del metodo contiene nodi senza
+    soluzione accanto a nodi con soluzione o un salto di ramo, o se in un punto
+    di controllo griglia e risolutore non concordano sull'esistenza della cuspide.
+    """
+
+    def __init__(self, sistema, case, obliquita, passo_ramc, latitudini, valori,
+                 errore_bilineare, errore_bicubico):
+        self.sistema = sistema
+        self.case = tuple(int(c) for c in case)
+        self.obliquita = float(obliquita)
+        self.passo_ramc = float(passo_ramc)
+        self.latitudini = np.asarray(latitudini, dtype=float)
+        self.valori = np.asarray(valori, dtype=np.float32)          # (n_lat, n_ramc, n_case)
+        self.errore_bilineare = np.asarray(errore_bilineare, dtype=np.float32)  # (n_lat - 1, n_ramc)
+        self.errore_bicubico = np.asarray(errore_bicubico, dtype=np.float32)
+
+    @property
+    def passo_latitudine(self):
+        return float(self.latitudini[1] - self.latitudini[0])
+
+    @classmethod
+    def costruisci(cls, sistema="placidus", passo_ramc=1.0, passo_latitudine=1.0,
+                   latitudine_max=66.0, obliquita=None):
+        """
+        Costruisce la griglia risolvendo esattamente le cuspidi su ogni nodo.
+
+        Args:
+            sistema (str): Sistema di case (chiave di `SISTEMI_CASE`).
+            passo_ramc (float): Passo in RAMC (gradi); deve dividere 360.
+            passo_latitudine (float): Passo in latitudine (gradi).
+            latitudine_max (float): La griglia copre [-latitudine_max, +latitudine_max].
+            obliquita (float): Obliquità dell'eclittica (default come `obliquita_eclittica`).
+
+        Returns:
+            GrigliaCase: La griglia con i limiti d'errore per cella.
+        """
+        case, risolutore = SISTEMI_CASE[sistema]
+        if obliquita is None:
+            obliquita = obliquita_eclittica(None)
+        n_ramc = int(round(360.0 / passo_ramc))
+        if not np.isclose(n_ramc * passo_ramc, 360.0):
+            raise ValueError("passo_ramc deve dividere 360°")
+        n_lat = int(round(2 * latitudine_max / passo_latitudine)) + 1
+        latitudini = np.linspace(-latitudine_max, latitudine_max, n_lat)
+        ramc = np.arange(n_ramc) * passo_ramc
+
+        valori = risolutore(ramc[None, :], latitudini[:, None], obliquita)
+        griglia = cls(sistema, case, obliquita, passo_ramc, latitudini, valori,
+                      np.zeros((n_lat - 1, n_ramc)), np.zeros((n_lat - 1, n_ramc)))
+
+        # Punti di controllo: griglia regolare interna a ogni cella
+        frazioni = (np.arange(CAMPIONI_PER_LATO) + 0.5) / CAMPIONI_PER_LATO
+        base_ramc, base_lat = ramc[None, :], latitudini[:-1, None]
+        controlli = [(fr * passo_ramc, fl * griglia.passo_latitudine) for fr in frazioni for fl in frazioni]
+        esatti = [risolutore(*np.broadcast_arrays(base_ramc + d_ramc, base_lat + d_lat), obliquita)
+                  for d_ramc, d_lat in controlli]
+        for metodo, attributo in (("bilineare", "errore_bilineare"), ("bicubica", "errore_bicubico")):
+            errore = np.zeros((n_lat - 1, n_ramc))
+            for (d_ramc, d_lat), esatto in zip(controlli, esatti):
+                r, l = np.broadcast_arrays(base_ramc + d_ramc, base_lat + d_lat)
+                stimato, _ = griglia.interpola(r, l, metodo=metodo)
+                diff = np.abs((stimato - esatto + 180.0) % 360.0 - 180.0)
+                # Radice che compare/scompare dentro la cella: errore non limitato
+                diff[np.isnan(stimato) != np.isnan(esatto)] = np.inf
+                errore = np.fmax(errore, np.fmax.reduce(diff, axis=-1))
+            errore = errore * FATTORE_SICUREZZA + ERRORE_MINIMO
+            errore[_stencil_instabile(griglia.valori, STENCIL[metodo])] = np.inf
+            setattr(griglia, attributo, errore.astype(np.float32))
+        return griglia
+
+    def salva(self, percorso):
+        """Salva la griglia in un file binario compresso (.npz)."""
+        np.savez_compressed(
+            percorso,
+            versione=VERSIONE_FORMATO,
+            sistema=self.sistema,
+            case=np.array(self.case, dtype=np.int8),
+            obliquita=self.obliquita,
+            passo_ramc=self.passo_ramc,
+            latitudini=self.latitudini,
+            valori=self.valori,
+            errore_bilineare=self.errore_bilineare,
+            errore_bicubico=self.errore_bicubico,
+        )
+
+    @classmethod
+    def carica(cls, percorso):
+        """Carica una griglia salvata con `salva`."""
+        with np.load(percorso) as dati:
+            if int(dati["versione"]) != VERSIONE_FORMATO:
+                raise ValueError(f"Formato griglia non supportato: {int(dati['versione'])}")
+            return cls(str(dati["sistema"]), dati["case"], float(dati["obliquita"]),
+                       float(dati["passo_ramc"]), dati["latitudini"], dati["valori"],
+                       dati["errore_bilineare"], dati["errore_bicubico"])
+
+    def interpola(self, ramc, latitudine, metodo="bicubica"):
+        """
+        Legge le cuspidi dalla griglia per array di RAMC e latitudine.
+
+        Args:
+            ramc (array): RAMC in gradi.
+            latitudine (array): Latitudine in gradi (broadcast con `ramc`).
+            metodo (str): "bilineare" oppure "bicubica".
+
+        Returns:
+            tuple: (cuspidi, errore). `cuspidi` ha forma (..., len(self.case)) in
+            gradi 0-360°; `errore` è il limite empirico d'errore della cella (gradi),
+            infinito dove l'interpolazione non è affidabile.
+            Le cuspidi senza soluzione sono NaN; fuori dalla griglia lo sono anche gli errori.
+        """
+        ramc, latitudine = np.broadcast_arrays(np.asarray(ramc, dtype=float),
+                                               np.asarray(latitudine, dtype=float))
+        n_lat, n_ramc, _ = self.valori.shape
+
+        x = (ramc % 360.0) / self.passo_ramc
+        y = (latitudine - self.latitudini[0]) / self.passo_latitudine
+        fuori = ~((y >= 0) & (y <= n_lat - 1))
+        y = np.where(fuori, 0.0, y)
+        i = np.floor(x).astype(np.intp) % n_ramc
+        j = np.minimum(np.floor(y).astype(np.intp), n_lat - 2)
+        tx, ty = x - np.floor(x), y - j
+
+        valori = self.valori.astype(float)
+        riferimento = valori[j, i]
+
+        def nodo(dj, di):
+            jj = np.clip(j + dj, 0, n_lat - 1)
+            return _scarto(valori[jj, (i + di) % n_ramc], riferimento)
+
+        if metodo == "bilineare":
+            tx_, ty_ = tx[..., None], ty[..., None]
+            basso = nodo(0, 0) * (1 - tx_) + nodo(0, 1) * tx_
+            alto = nodo(1, 0) * (1 - tx_) + nodo(1, 1) * tx_
+            cuspidi = basso * (1 - ty_) + alto * ty_
+            errore = self.errore_bilineare[j, i]
+        elif metodo == "bicubica":
+            righe = [_catmull_rom(nodo(dj, -1), nodo(dj, 0), nodo(dj, 1), nodo(dj, 2), tx)
+                     for dj in (-1, 0, 1, 2)]
+            cuspidi = _catmull_rom(*righe, ty)
+            errore = self.errore_bicubico[j, i]
+        else:
+            raise ValueError(f"Metodo di interpolazione sconosciuto: {metodo}")
+
+        cuspidi = np.where(fuori[..., None], np.nan, cuspidi % 360.0)
+        errore = np.where(fuori | np.isnan(cuspidi).all(axis=-1), np.nan, errore)
+        return cuspidi, errore
+
+    def cuspide(self, casa_num, ramc, latitudine, metodo="bicubica"):
+        """Come `placidus_cuspide`, ma letta dalla griglia: restituisce (cuspide, errore)."""
+        cuspidi, errore = self.interpola(ramc, latitudine, metodo=metodo)
+        return cuspidi[..., self.case.index(casa_num)], errore
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    griglia = GrigliaCase.costruisci("placidus", passo_ramc=1.0, passo_latitudine=1.0)
+    griglia.salva("griglia_placidus.npz")
+    griglia = GrigliaCase.carica("griglia_placidus.npz")
+
+    ramc, latitudine = 63.109, 45.32
+    esatte = _cuspidi_placidus(ramc, latitudine, griglia.obliquita)
+    for metodo in ("bilineare", "bicubica"):
+        cuspidi, errore = griglia.interpola(ramc, latitudine, metodo=metodo)
+        for casa, grado, vero in zip(griglia.case, cuspidi, esatte):
+            print(f"[{metodo}] Casa {casa}: {grado:.4f}° (esatto {vero:.4f}°)")
+        print(f"[{metodo}] Limite d'errore della cella: {errore:.4f}°")
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def espandi_intervalli(inizio, fine, da=0, a=None):
+    """
+    Mette in fila gli elementi degli intervalli [inizio[k], fine[k]) e ne
+    restituisce quelli di posto da `da` (incluso) ad `a` (escluso).
+
+    Serve a trasformare le finestre trovate con `np.searchsorted` su un vettore
+    ordinato in coppie (intervallo, posizione) senza cicli Python.
+
+    Returns:
+        tuple: (intervallo, posizione): indice dell'intervallo e posizione nel
+        vettore ordinato di ogni elemento.
+    """
+    inizio, fine = np.asarray(inizio), np.asarray(fine)
+    conteggi = fine - inizio
+    cumulati = np.cumsum(conteggi)
+    totale = int(cumulati[-1]) if cumulati.size else 0
+    elementi = np.arange(da, totale if a is None else min(a, totale))
+    intervallo = np.searchsorted(cumulati, elementi, side="right")
+    return intervallo, inizio[intervallo] + elementi - (cumulati[intervallo] - conteggi[intervallo])
+
+
+def blocchi_intervalli(inizio, fine, limite):
+    """Come `espandi_intervalli`, a blocchi di al più `limite` elementi."""
+    totale = int(np.sum(np.asarray(fine) - np.asarray(inizio)))
+    for da in range(0, totale, limite):
+        yield espandi_intervalli(inizio, fine, da, da + limite)
@@ -0,0 +1,220 @@
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba è opzionale: senza, si usa il backend NumPy
+    numba = None
+
+NUMBA_DISPONIBILE = numba is not None
+
+# Stesse costanti di legacy/asc.py
+VERY_SMALL = 1e-10
+DEGTORAD = math.pi / 180.0
+RADTODEG = 180.0 / math.pi
+
+
+# -------------------------------
+# Kernel scalari (porting fedele di legacy/asc.py e axes.py)
+# -------------------------------
+def _ascendente_ausiliario(x, latitudine, sine, cosine):
+    ausiliario = -math.tan(latitudine * DEGTORAD) * sine + cosine * math.cos(x * DEGTORAD)
+    if abs(ausiliario) < VERY_SMALL:
+        ausiliario = 0.0
+    sinx = math.sin(x * DEGTORAD)
+    if abs(sinx) < VERY_SMALL:
+        sinx = 0.0
+    if sinx == 0:
+        if ausiliario < 0:
+            ausiliario = -VERY_SMALL
+        else:
+            ausiliario = VERY_SMALL
+    elif ausiliario == 0:
+        if sinx < 0:
+            ausiliario = -90.0
+        else:
+            ausiliario = 90.0
+    else:
+        ausiliario = math.atan(sinx / ausiliario) * RADTODEG
+    if ausiliario < 0:
+        ausiliario = 180.0 + ausiliario
+    return ausiliario
+
+
+def _crea_ascendente(ausiliario):
+    """
+    Costruisce `_ascendente` attorno a un ausiliario dato: lo stesso corpo serve
+    sia per il kernel Python sia per quello Numba (che deve chiamare l'ausiliario
+    compilato), così le due versioni non possono divergere.
+    """
+    def _ascendente(x1, latitudine, sine, cosine):
+        quadrante = int((x1 / 90) + 1)  # calcolato prima della normalizzazione, come in legacy/asc.py
+        x1 = x1 % 360.0
+        if abs(90 - latitudine) < VERY_SMALL:
+            return 180.0
+        if abs(90 + latitudine) < VERY_SMALL:
+            return 0.0
+        if quadrante == 1:
+            ascendente = ausiliario(x1, latitudine, sine, cosine)
+        elif quadrante == 2:
+            ascendente = 180.0 - ausiliario(180.0 - x1, -latitudine, sine, cosine)
+        elif quadrante == 3:
+            ascendente = 180.0 + ausiliario(x1 - 180.0, -latitudine, sine, cosine)
+        else:
+            ascendente = 360.0 - ausiliario(360.0 - x1, latitudine, sine, cosine)
+        return ascendente % 360.0
+
+    return _ascendente
+
+
+_ascendente = _crea_ascendente(_ascendente_ausiliario)
+
+
+def _asc_mc(ora_siderale_locale, latitudine, obliquita):
+    ramc_rad = math.radians(ora_siderale_locale * 15)
+    lat_rad = math.radians(latitudine)
+    obl_rad = math.radians(obliquita)
+    mc = math.degrees(math.atan2(math.sin(ramc_rad) * math.cos(obl_rad), math.cos(ramc_rad))) % 360
+    asc = math.degrees(math.atan2(
+        math.cos(ramc_rad),
+        - (math.sin(ramc_rad) * math.cos(lat_rad) + math.tan(lat_rad) * math.sin(lat_rad))
+    )) % 360
+    return asc, mc
+
+
+# -------------------------------
+# Backend NumPy
+# -------------------------------
+def _ascendente_ausiliario_numpy(x, latitudine, sine, cosine):
+    ausiliario = -np.tan(latitudine * DEGTORAD) * sine + cosine * np.cos(x * DEGTORAD)
+    ausiliario = np.where(np.abs(ausiliario) < VERY_SMALL, 0.0, ausiliario)
+    sinx = np.sin(x * DEGTORAD)
+    sinx = np.where(np.abs(sinx) < VERY_SMALL, 0.0, sinx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        generico = np.arctan(sinx / ausiliario) * RADTODEG
+    ausiliario = np.where(
+        sinx == 0,
+        np.where(ausiliario < 0, -VERY_SMALL, VERY_SMALL),
+        np.where(ausiliario == 0, np.where(sinx < 0, -90.0, 90.0), generico),
+    )
+    return np.where(ausiliario < 0, 180.0 + ausiliario, ausiliario)
+
+
+def _ascendente_numpy(x1, latitudine, sine, cosine):
+    """Porting senza rami di `_ascendente`: i quadranti diventano maschere."""
+    x1, latitudine, sine, cosine = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (x1, latitudine, sine, cosine))
+    )
+    quadrante = np.trunc((x1 / 90) + 1)
+    x1 = x1 % 360.0
+    q2, q3 = quadrante == 2, quadrante == 3
+    q4 = ~((quadrante == 1) | q2 | q3)
+    # q1: aux(x1, lat)            q2: 180 - aux(180 - x1, -lat)
+    # q3: 180 + aux(x1 - 180, -lat)   altrimenti: 360 - aux(360 - x1, lat)
+    argomento = np.select([q2, q3, q4], [180.0 - x1, x1 - 180.0, 360.0 - x1], x1)
+    base = np.select([q2 | q3, q4], [180.0, 360.0], 0.0)
+    segno = np.where(q2 | q4, -1.0, 1.0)
+    lat_quadrante = np.where(q2 | q3, -latitudine, latitudine)
+    ascendente = (base + segno * _ascendente_ausiliario_numpy(argomento, lat_quadrante, sine, cosine)) % 360.0
+    ascendente = np.where(np.abs(90 + latitudine) < VERY_SMALL, 0.0, ascendente)
+    return np.where(np.abs(90 - latitudine) < VERY_SMALL, 180.0, ascendente)
+
+
+def _asc_mc_numpy(ora_siderale_locale, latitudine, obliquita):
+    ramc_rad = np.radians(ora_siderale_locale * 15)
+    lat_rad = np.radians(latitudine)
+    obl_rad = np.radians(obliquita)
+    mc = np.degrees(np.arctan2(np.sin(ramc_rad) * np.cos(obl_rad), np.cos(ramc_rad))) % 360
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc_rad),
+        - (np.sin(ramc_rad) * np.cos(lat_rad) + np.tan(lat_rad) * np.sin(lat_rad))
+    )) % 360
+    return asc, mc
+
+
+# -------------------------------
+# Backend Numba (cicli paralleli sui kernel compilati)
+# -------------------------------
+if NUMBA_DISPONIBILE:
+    _ascendente_ausiliario_jit = numba.njit(cache=True)(_ascendente_ausiliario)
+
+    _ascendente_jit = numba.njit(cache=True)(_crea_ascendente(_ascendente_ausiliario_jit))
+
+    _asc_mc_jit = numba.njit(cache=True)(_asc_mc)
+
+    @numba.njit(parallel=True, cache=True)
+    def _ascendente_parallelo(x1, latitudine, sine, cosine, out):
+        for k in numba.prange(x1.size):
+            out[k] = _ascendente_jit(x1[k], latitudine[k], sine[k], cosine[k])
+
+    @numba.njit(parallel=True, cache=True)
+    def _asc_mc_parallelo(ora_siderale_locale, latitudine, obliquita, asc, mc):
+        for k in numba.prange(ora_siderale_locale.size):
+            asc[k], mc[k] = _asc_mc_jit(ora_siderale_locale[k], latitudine[k], obliquita[k])
+
+
+def _scegli_backend(backend):
+    if backend == "auto":
+        return "numba" if NUMBA_DISPONIBILE else "numpy"
+    if backend == "numba" and not NUMBA_DISPONIBILE:
+        raise ImportError("Il backend 'numba' richiede il pacchetto numba")
+    if backend not in ("numba", "numpy"):
+        raise ValueError(f"Backend sconosciuto: {backend}")
+    return backend
+
+
+def _appiattisci(*argomenti):
+    argomenti = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in argomenti))
+    forma = argomenti[0].shape
+    return forma, [np.ascontiguousarray(a).ravel() for a in argomenti]
+
+
+def ascendente(x1, latitudine, sine, cosine, backend="auto"):
+    """
+    Versione su array di `legacy/asc.calculate_ascendant`, con gli stessi rami.
+
+    Args:
+        x1 (array): Angolo in gradi (RAMC + 90° per l'Ascendente).
+        latitudine (array): Latitudine geografica in gradi.
+        sine (array): Seno dell'obliquità dell'eclittica.
+        cosine (array): Coseno dell'obliquità dell'eclittica.
+        backend (str): "auto" (Numba se installato), "numba" oppure "numpy".
+
+    Returns:
+        array: Ascendente in gradi (0-360°), con la forma del broadcast degli argomenti.
+    """
+    backend = _scegli_backend(backend)
+    if backend == "numpy":
+        return _ascendente_numpy(x1, latitudine, sine, cosine)
+    forma, (x1, latitudine, sine, cosine) = _appiattisci(x1, latitudine, sine, cosine)
+    out = np.empty(x1.size)
+    _ascendente_parallelo(x1, latitudine, sine, cosine, out)
+    return out.reshape(forma)
+
+
+def punti_cardinali(ora_siderale_locale, latitudine, obliquita=23.43, backend="auto"):
+    """
+    Versione su array di `axes.calcola_punti_cardinali`.
+
+    Args:
+        ora_siderale_locale (array): Ore (0-24).
+        latitudine (array): Gradi decimali (Nord +, Sud -).
+        obliquita (array): Obliquità dell'eclittica (default 23.43°).
+        backend (str): "auto" (Numba se installato), "numba" oppure "numpy".
+
+    Returns:
+        dict: ASC, DSC, MC, IC come array in gradi zodiacali (0-360°).
+    """
+    backend = _scegli_backend(backend)
+    if backend == "numpy":
+        asc, mc = _asc_mc_numpy(np.asarray(ora_siderale_locale, dtype=float),
+                                np.asarray(latitudine, dtype=float),
+                                np.asarray(obliquita, dtype=float))
+    else:
+        forma, (lst, lat, obl) = _appiattisci(ora_siderale_locale, latitudine, obliquita)
+        asc, mc = np.empty(lst.size), np.empty(lst.size)
+        _asc_mc_parallelo(lst, lat, obl, asc, mc)
+        asc, mc = asc.reshape(forma), mc.reshape(forma)
+    return {"ASC": asc, "DSC": (asc + 180) % 360, "MC": mc, "IC": (mc + 180) % 360}
+
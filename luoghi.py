@@ -0,0 +1,176 @@
+import os
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# File locale in formato GeoNames (cities15000.txt e simili: 19 colonne separate da tab)
+PERCORSO_PREDEFINITO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dati", "luoghi.tsv")
+
+RAGGIO_TERRESTRE_KM = 6371.0
+
+
+def normalizza(nome):
+    """Chiave di ricerca: minuscole, senza accenti e con spazi singoli."""
+    nome = unicodedata.normalize("NFKD", nome)
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return " ".join(nome.casefold().split())
+
+
+def _trigrammi(chiave):
+    chiave = f"  {chiave} "
+    return {chiave[i:i + 3] for i in range(len(chiave) - 2)}
+
+
+def _vettori_unitari(latitudine, longitudine):
+    lat, lon = np.radians(latitudine), np.radians(longitudine)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+class Gazzettiere:
+    """
+    Database offline dei luoghi con indici per nome (prefisso e trigrammi) e
+    per posizione (KD-tree). Ogni luogo ha il suo fuso orario IANA.
+    """
+
+    def __init__(self, nomi, paesi, latitudini, longitudini, zone, popolazioni, alternativi=None):
+        self.nomi = np.asarray(nomi, dtype=object)
+        self.paesi = np.asarray(paesi, dtype=object)
+        self.latitudini = np.asarray(latitudini, dtype=float)
+        self.longitudini = np.asarray(longitudini, dtype=float)
+        self.zone = np.asarray(zone, dtype=object)
+        self.popolazioni = np.asarray(popolazioni, dtype=np.int64)
+        alternativi = alternativi if alternativi is not None else [()] * len(self.nomi)
+
+        # Indice per prefisso: chiavi ordinate (nome e nomi alternativi) -> id del luogo
+        chiavi, ids = [], []
+        for i, (nome, altri) in enumerate(zip(self.nomi, alternativi)):
+            for chiave in {normalizza(n) for n in (nome, *altri) if n}:
+                chiavi.append(chiave)
+                ids.append(i)
+        ordine = np.argsort(np.array(chiavi, dtype=str), kind="stable")
+        self._chiavi = np.array(chiavi, dtype=str)[ordine]
+        self._ids_chiavi = np.array(ids, dtype=np.int64)[ordine]
+
+        # Corrispondenza esatta: a parità di nome vince il luogo più popoloso
+        self._esatti = {}
+        for chiave, i in zip(self._chiavi.tolist(), self._ids_chiavi.tolist()):
+            migliore = self._esatti.get(chiave)
+            if migliore is None or self.popolazioni[i] > self.popolazioni[migliore]:
+                self._esatti[chiave] = i
+
+        self._indice_trigrammi = None
+        self._albero = cKDTree(_vettori_unitari(self.latitudini, self.longitudini))
+
+    @classmethod
+    def carica(cls, percorso=PERCORSO_PREDEFINITO):
+        """
+        Carica un file in formato GeoNames (geonameid, name, asciiname,
+        alternatenames, latitude, longitude, ..., population, ..., timezone).
+        """
+        nomi, paesi, latitudini, longitudini, zone, popolazioni, alternativi = ([] for _ in range(7))
+        with open(percorso, encoding="utf-8") as f:
+            for riga in f:
+                if not riga.strip() or riga.startswith("#"):
+                    continue
+                campi = riga.rstrip("\n").split("\t")
+                nomi.append(campi[1])
+                alternativi.append(tuple([campi[2]] + [a for a in campi[3].split(",") if a]))
+                latitudini.append(float(campi[4]))
+                longitudini.append(float(campi[5]))
+                paesi.append(campi[8])
+                popolazioni.append(int(campi[14] or 0))
+                zone.append(campi[17])
+        return cls(nomi, paesi, latitudini, longitudini, zone, popolazioni, alternativi)
+
+    def __len__(self):
+        return len(self.nomi)
+
+    def cerca_prefisso(self, prefisso, limite=10):
+        """Luoghi il cui nome (o un nome alternativo) inizia con `prefisso`, i più popolosi prima."""
+        chiave = normalizza(prefisso)
+        inizio = np.searchsorted(self._chiavi, chiave, side="left")
+        fine = np.searchsorted(self._chiavi, chiave + "\U0010ffff", side="left")
+        ids = np.unique(self._ids_chiavi[inizio:fine])
+        return ids[np.argsort(-self.popolazioni[ids], kind="stable")][:limite]
+
+    def cerca_simili(self, nome, limite=5, soglia=0.3):
+        """Ricerca approssimata per somiglianza di trigrammi (coefficiente di Jaccard)."""
+        if self._indice_trigrammi is None:
+            indice = defaultdict(list)
+            for k, chiave in enumerate(self._chiavi.tolist()):
+                for trigramma in _trigrammi(chiave):
+                    indice[trigramma].append(k)
+            self._indice_trigrammi = {t: np.array(v, dtype=np.int64) for t, v in indice.items()}
+
+        trigrammi = _trigrammi(normalizza(nome))
+        candidati = [self._indice_trigrammi[t] for t in trigrammi if t in self._indice_trigrammi]
+        if not candidati:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        chiavi, comuni = np.unique(np.concatenate(candidati), return_counts=True)
+        lunghezze = np.array([len(_trigrammi(c)) for c in self._chiavi[chiavi].tolist()])
+        punteggi = comuni / (len(trigrammi) + lunghezze - comuni)
+
+        ordine = np.argsort(-punteggi, kind="stable")
+        ids, visti, migliori = self._ids_chiavi[chiavi[ordine]], set(), []
+        for i, punteggio in zip(ids.tolist(), punteggi[ordine].tolist()):
+            if punteggio < soglia or len(migliori) == limite:
+                break
+            if i not in visti:
+                visti.add(i)
+                migliori.append((i, punteggio))
+        return np.array([i for i, _ in migliori], dtype=np.int64), np.array([p for _, p in migliori])
+
+    def risolvi(self, nomi, approssimato=False):
+        """
+        Risolve un elenco di nomi in (latitudine, longitudine, fuso orario).
+
+        Ogni nome distinto viene cercato una sola volta: prima per corrispondenza
+        esatta, poi (se `approssimato`) con `cerca_simili`.
+
+        Returns:
+            tuple: (latitudini, longitudini, zone, ids): array allineati a `nomi`;
+            per i nomi non trovati ids = -1, coordinate NaN e zona vuota.
+        """
+        distinti, inversa = np.unique(np.asarray(nomi, dtype=str), return_inverse=True)
+        trovati = np.full(distinti.size, -1, dtype=np.int64)
+        for k, nome in enumerate(distinti.tolist()):
+            i = self._esatti.get(normalizza(nome))
+            if i is None and approssimato:
+                simili, _ = self.cerca_simili(nome, limite=1)
+                i = simili[0] if simili.size else None
+            if i is not None:
+                trovati[k] = i
+
+        ids = trovati[inversa.ravel()]
+        validi = ids >= 0
+        latitudini = np.where(validi, self.latitudini[ids], np.nan)
+        longitudini = np.where(validi, self.longitudini[ids], np.nan)
+        zone = np.where(validi, self.zone[ids], "")
+        return latitudini, longitudini, zone, ids
+
+    def piu_vicini(self, latitudine, longitudine, k=1):
+        """
+        Luoghi più vicini a array di coordinate (ricerca inversa con KD-tree).
+
+        Returns:
+            tuple: (ids, distanze_km), con forma (..., k) se k > 1.
+        """
+        k = min(k, len(self))
+        corde, ids = self._albero.query(_vettori_unitari(latitudine, longitudine), k=k)
+        distanze = 2 * RAGGIO_TERRESTRE_KM * np.arcsin(np.clip(corde / 2, 0.0, 1.0))
+        return ids, distanze
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    gazzettiere = Gazzettiere.carica()
+    lat, lon, zone, _ = gazzettiere.risolvi(["Montichiari", "Rome", "Nuova Delhi", "Guidizolo"],
+                                            approssimato=True)
+    for riga in zip(lat, lon, zone):
+        print("Luogo: lat {:.5f}, lon {:.5f}, fuso {}".format(*riga))
+
+    print("Prefisso 'new':", list(gazzettiere.nomi[gazzettiere.cerca_prefisso("new")]))
+    ids, distanze = gazzettiere.piu_vicini(45.0, 10.58)
+    print(f"Più vicino a (45.0, 10.58): {gazzettiere.nomi[ids]} a {distanze:.1f} km")
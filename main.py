@@ -1,6 +1,10 @@
+import argparse
 from skyfield.api import load
 from datetime import datetime, timezone
 
+from effemeridi import CORPI
+from profilazione import PROFILO
+
 def trova_segno_zodiacale(longitudine):
     """Restituisce il segno zodiacale corrispondente alla longitudine eclittica."""
     segni = [
@@ -23,29 +27,33 @@ def trova_segno_zodiacale(longitudine):
             return segno
     return "Errore"
 
+parser = argparse.ArgumentParser(description="Segni zodiacali dei pianeti nell'istante attuale.")
+parser.add_argument("--profilo", nargs="?", const="testo", choices=["testo", "json", "prometheus"],
+                    help="stampa i tempi per fase (testo, json o prometheus)")
+argomenti = parser.parse_args()
+PROFILO.attiva(argomenti.profilo is not None)
+
 # Carica le effemeridi della NASA
-eph = load('de421.bsp')
-pianeti = {
-    "Sole": eph['sun'],
-    "Luna": eph['moon'],
-    "Mercurio": eph['mercury'],
-    "Venere": eph['venus'],
-    "Marte": eph['mars'],
-    "Giove": eph['jupiter barycenter'],
-    "Saturno": eph['saturn barycenter'],
-    "Urano": eph['uranus barycenter'],
-    "Nettuno": eph['neptune barycenter'],
-    "Plutone": eph['pluto barycenter'],
-}
+with PROFILO.fase("carica_effemeridi"):
+    eph = load('de421.bsp')
+pianeti = {nome: eph[bersaglio] for nome, bersaglio in CORPI.items()}
 terra = eph['earth']
 
 # Ottieni il tempo UTC attuale
-t = load.timescale().utc(datetime.now(timezone.utc))
+with PROFILO.fase("tempo"):
+    t = load.timescale().utc(datetime.now(timezone.utc))
 
 # Calcola il segno zodiacale di ogni pianeta
 print(f"UTC: {t.utc_iso()}\n")
 for nome, corpo in pianeti.items():
-    astro = terra.at(t).observe(corpo).apparent()
-    lat, lon, distance = astro.ecliptic_latlon()
-    segno = trova_segno_zodiacale(lon.degrees)
+    with PROFILO.fase("osserva_apparente"):
+        astro = terra.at(t).observe(corpo).apparent()
+    with PROFILO.fase("coordinate_eclittiche"):
+        lat, lon, distance = astro.ecliptic_latlon()
+    with PROFILO.fase("segno"):
+        segno = trova_segno_zodiacale(lon.degrees)
     print(f"{nome}: {lon.degrees}° → {segno}")
+
+if argomenti.profilo:
+    print()
+    print(PROFILO.esporta(argomenti.profilo))
@@ -0,0 +1,94 @@
+import numpy as np
+
+from carta_batch import tempo_siderale_locale
+from effemeridi import posizioni_equatoriali
+
+RAGGIO_TERRESTRE_KM = 6378.14
+
+
+def rifrazione(altitudine, pressione=1010.0, temperatura=10.0):
+    """
+    Rifrazione atmosferica (formula di Sæmundsson) in gradi, da sommare all'altitudine vera.
+
+    Args:
+        altitudine (array): Altitudine geometrica in gradi.
+        pressione (float): Pressione in millibar.
+        temperatura (float): Temperatura in °C.
+
+    Returns:
+        array: Correzione in gradi; nulla sotto -1° (oggetto ben sotto l'orizzonte).
+    """
+    h = np.asarray(altitudine, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = 1.02 / np.tan(np.radians(h + 10.3 / (h + 5.11))) / 60.0
+    r *= (pressione / 1010.0) * (283.0 / (273.0 + temperatura))
+    return np.where((h >= -1.0) & (h <= 90.0), r, 0.0)
+
+
+def coordinate_orizzontali(ra, dec, lst, latitudine, distanza_km=None, rifrazione_atmosferica=False,
+                           pressione=1010.0, temperatura=10.0):
+    """
+    Converte coordinate equatoriali in altitudine e azimut (stessa trigonometria di
+    legacy/advanced_v2.horizontal_coords), su array con broadcasting.
+
+    Per una griglia corpi × tempi × siti basta dare le forme adatte, ad esempio
+    `ra[:, :, None]`, `lst[None, :, :]`, `latitudine[None, None, :]`.
+
+    Args:
+        ra (array): Ascensione retta in gradi.
+        dec (array): Declinazione in gradi.
+        lst (array): Tempo siderale locale in gradi.
+        latitudine (array): Latitudine dell'osservatore in gradi.
+        distanza_km (array): Distanza geocentrica; se data, corregge la parallasse in altitudine.
+        rifrazione_atmosferica (bool): Se True restituisce l'altitudine apparente.
+        pressione (float): Pressione in millibar (solo con rifrazione).
+        temperatura (float): Temperatura in °C (solo con rifrazione).
+
+    Returns:
+        tuple: (altitudine, azimut) in gradi; azimut da nord verso est (0-360°).
+    """
+    dec = np.radians(dec)
+    lat = np.radians(latitudine)
+    HA = np.radians(np.asarray(lst, dtype=float) - ra)  # Angolo orario
+
+    sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    cos_HA = np.cos(HA)
+
+    alt = np.degrees(np.arcsin(np.clip(sin_lat*sin_dec + cos_lat*cos_dec*cos_HA, -1.0, 1.0)))
+    az = np.degrees(np.arctan2(-cos_dec*np.sin(HA), sin_dec*cos_lat - cos_dec*sin_lat*cos_HA)) % 360
+
+    if distanza_km is not None:
+        parallasse = np.arcsin(RAGGIO_TERRESTRE_KM / np.asarray(distanza_km, dtype=float))
+        alt = alt - np.degrees(np.arcsin(np.sin(parallasse) * np.cos(np.radians(alt))))
+    if rifrazione_atmosferica:
+        alt = alt + rifrazione(alt, pressione, temperatura)
+    return alt, az
+
+
+def stato_cielo(nomi, jd, latitudini, longitudini, parallasse=True, rifrazione_atmosferica=False):
+    """
+    Altitudine e azimut di più corpi, per più istanti e più siti, in un solo broadcast.
+
+    Args:
+        nomi (list): Nomi dei corpi (chiavi di `effemeridi.CORPI`).
+        jd (array): Giorni giuliani (UT), 1-D.
+        latitudini (array): Latitudini dei siti in gradi, 1-D.
+        longitudini (array): Longitudini dei siti in gradi (positive a est), 1-D.
+        parallasse (bool): Corregge la parallasse (rilevante solo per la Luna).
+        rifrazione_atmosferica (bool): Se True restituisce altitudini apparenti.
+
+    Returns:
+        tuple: (altitudine, azimut) con forma (corpi, tempi, siti).
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    latitudini = np.atleast_1d(np.asarray(latitudini, dtype=float))
+    longitudini = np.atleast_1d(np.asarray(longitudini, dtype=float))
+
+    ra, dec, distanza = posizioni_equatoriali(nomi, jd)
+    lst = tempo_siderale_locale(jd[:, None], longitudini[None, :])
+    return coordinate_orizzontali(
+        ra[:, :, None], dec[:, :, None], lst[None, :, :], latitudini[None, None, :],
+        distanza_km=distanza[:, :, None] if parallasse else None,
+        rifrazione_atmosferica=rifrazione_atmosferica,
+    )
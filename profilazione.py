@@ -0,0 +1,123 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+# Contesto vuoto condiviso: a profilazione spenta `fase()` non crea oggetti
+_NULLA = nullcontext()
+
+
+class _Fase:
+    __slots__ = ("profilo", "nome", "inizio")
+
+    def __init__(self, profilo, nome):
+        self.profilo = profilo
+        self.nome = nome
+
+    def __enter__(self):
+        self.inizio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        self.profilo.tempi[self.nome] += time.perf_counter_ns() - self.inizio
+        self.profilo.chiamate[self.nome] += 1
+        return False
+
+
+class Profilo:
+    """
+    Tempi per fase e contatori della pipeline, attivabili a richiesta.
+
+    Uso:
+        with PROFILO.fase("osserva_apparente"):
+            ...
+        PROFILO.conta("root_scalar_iterazioni", sol.iterations)
+
+    Da spento `fase()` restituisce un contesto vuoto condiviso e `conta()` esce
+    subito, quindi il costo resta di una chiamata di funzione per punto misurato.
+    """
+
+    def __init__(self):
+        self.attivo = False
+        self.tempi = defaultdict(int)      # nanosecondi per fase
+        self.chiamate = defaultdict(int)
+        self.contatori = defaultdict(int)
+
+    def attiva(self, attivo=True):
+        self.attivo = attivo
+
+    def azzera(self):
+        self.tempi.clear()
+        self.chiamate.clear()
+        self.contatori.clear()
+
+    def fase(self, nome):
+        return _Fase(self, nome) if self.attivo else _NULLA
+
+    def conta(self, nome, quanti=1):
+        if self.attivo:
+            self.contatori[nome] += int(quanti)
+
+    def riepilogo(self):
+        """Dizionario con fasi (secondi e chiamate), contatori e tassi di successo della cache."""
+        totale = sum(self.tempi.values())
+        fasi = {
+            nome: {
+                "secondi": ns / 1e9,
+                "chiamate": self.chiamate[nome],
+                "quota": ns / totale if totale else 0.0,
+            }
+            for nome, ns in sorted(self.tempi.items(), key=lambda voce: -voce[1])
+        }
+        tassi = {}
+        for nome in self.contatori:
+            if nome.endswith("_trovati"):
+                prefisso = nome[:-len("_trovati")]
+                trovati, mancanti = self.contatori[nome], self.contatori[prefisso + "_mancanti"]
+                if trovati + mancanti:
+                    tassi[prefisso] = trovati / (trovati + mancanti)
+        return {"fasi": fasi, "contatori": dict(self.contatori), "tasso_successo": tassi}
+
+    def esporta_json(self, indentazione=2):
+        return json.dumps(self.riepilogo(), indent=indentazione)
+
+    def esporta_prometheus(self, prefisso="astro"):
+        """Formato testuale di esposizione di Prometheus."""
+        righe = [
+            f"# HELP {prefisso}_fase_secondi_total Tempo cumulato per fase della pipeline.",
+            f"# TYPE {prefisso}_fase_secondi_total counter",
+        ]
+        righe += [f'{prefisso}_fase_secondi_total{{fase="{nome}"}} {ns / 1e9:.9f}'
+                  for nome, ns in sorted(self.tempi.items())]
+        righe += [
+            f"# HELP {prefisso}_fase_chiamate_total Numero di esecuzioni per fase.",
+            f"# TYPE {prefisso}_fase_chiamate_total counter",
+        ]
+        righe += [f'{prefisso}_fase_chiamate_total{{fase="{nome}"}} {n}'
+                  for nome, n in sorted(self.chiamate.items())]
+        righe += [
+            f"# HELP {prefisso}_eventi_total Contatori (iterazioni, fallimenti, cache).",
+            f"# TYPE {prefisso}_eventi_total counter",
+        ]
+        righe += [f'{prefisso}_eventi_total{{nome="{nome}"}} {n}'
+                  for nome, n in sorted(self.contatori.items())]
+        return "\n".join(righe) + "\n"
+
+    def esporta_testo(self):
+        riepilogo = self.riepilogo()
+        righe = [f"{'fase':24s} {'secondi':>10s} {'chiamate':>9s} {'quota':>7s}"]
+        for nome, fase in riepilogo["fasi"].items():
+            righe.append(f"{nome:24s} {fase['secondi']:10.4f} {fase['chiamate']:9d} {fase['quota']:7.1%}")
+        for nome, n in sorted(riepilogo["contatori"].items()):
+            righe.append(f"{nome:24s} {n:10d}")
+        for nome, tasso in riepilogo["tasso_successo"].items():
+            righe.append(f"{'successo ' + nome:24s} {tasso:10.1%}")
+        return "\n".join(righe)
+
+    def esporta(self, formato="testo"):
+        return {"testo": self.esporta_testo, "json": self.esporta_json,
+                "prometheus": self.esporta_prometheus}[formato]()
+
+
+# Profilo globale del processo, usato da tutti i moduli
+PROFILO = Profilo()
@@ -0,0 +1,90 @@
+import numpy as np
+
+from carta_batch import OBLIQUITA, cuspidi_batch
+
+# Punti seguiti durante la scansione: cuspidi 1-12 (1 = ASC, 4 = IC, 7 = DSC, 10 = MC)
+PUNTI = tuple(f"Casa {casa}" for casa in range(1, 13))
+
+DTYPE_ATTRAVERSAMENTO = np.dtype([
+    ("punto", np.int8),    # indice in PUNTI (casa - 1)
+    ("jd", np.float64),    # istante del passaggio (UT)
+    ("da", np.int16),      # segno (o grado) prima del passaggio
+    ("a", np.int16),       # segno (o grado) dopo il passaggio
+])
+
+
+def scansione(jd_centro, latitudine, longitudine, ore=12.0, passo_secondi=60.0,
+              ampiezza=30.0, obliquita=OBLIQUITA, iterazioni=30, backend="auto"):
+    """
+    Scansione di angoli e cuspidi su ±`ore` attorno a un istante, per la rettifica.
+
+    Tutta la finestra è valutata come array; i passaggi di segno (`ampiezza=30`)
+    o di grado (`ampiezza=1`) vengono trovati confrontando i campioni vicini e
+    raffinati insieme per bisezione. Se fra due campioni un punto salta più di
+    un confine (passo troppo lungo), viene registrato solo il primo.
+
+    Args:
+        jd_centro (float): Istante centrale (giorno giuliano UT).
+        latitudine (float): Latitudine in gradi.
+        longitudine (float): Longitudine in gradi (positiva a est).
+        ore (float): Semiampiezza della finestra in ore.
+        passo_secondi (float): Passo di campionamento in secondi.
+        ampiezza (float): Ampiezza degli intervalli sorvegliati in gradi (30 = segni).
+        obliquita (float): Obliquità dell'eclittica in gradi.
+        iterazioni (int): Passi di bisezione (30 bastano per scendere sotto il ms).
+        backend (str): Backend dei kernel degli angoli.
+
+    Returns:
+        tuple: (jd, cuspidi, attraversamenti): istanti campionati, cuspidi con forma
+        (n, 12) e array strutturato `DTYPE_ATTRAVERSAMENTO` ordinato per istante.
+    """
+    passo = passo_secondi / 86400.0
+    n = int(round(2 * ore * 3600 / passo_secondi)) + 1
+    jd = jd_centro - ore / 24 + np.arange(n) * passo
+    cuspidi = cuspidi_batch(jd, latitudine, longitudine, obliquita, backend=backend)
+
+    n_intervalli = int(round(360.0 / ampiezza))
+    intervallo = np.floor(cuspidi / ampiezza)
+    prima, dopo = intervallo[:-1], intervallo[1:]
+    k, punto = np.nonzero((prima != dopo) & ~np.isnan(prima) & ~np.isnan(dopo))
+    da, a = prima[k, punto].astype(int), dopo[k, punto].astype(int)
+
+    # Confine attraversato: quello adiacente a `da` nel verso del moto
+    avanti = (a - da) % n_intervalli <= n_intervalli // 2
+    confine = np.where(avanti, (da + 1) % n_intervalli, da) * ampiezza
+
+    def scarto(t):
+        valori = cuspidi_batch(t, latitudine, longitudine, obliquita, backend=backend)
+        valori = valori[np.arange(t.size), punto]
+        return (valori - confine + 180.0) % 360.0 - 180.0
+
+    t0, t1 = jd[k], jd[k + 1]
+    f0 = scarto(t0)
+    for _ in range(iterazioni):
+        m = 0.5 * (t0 + t1)
+        fm = scarto(m)
+        sinistra = (f0 < 0) != (fm < 0)
+        t1 = np.where(sinistra, m, t1)
+        t0 = np.where(sinistra, t0, m)
+        f0 = np.where(sinistra, f0, fm)
+
+    attraversamenti = np.empty(k.size, dtype=DTYPE_ATTRAVERSAMENTO)
+    attraversamenti["punto"] = punto
+    attraversamenti["jd"] = 0.5 * (t0 + t1)
+    attraversamenti["da"] = da
+    attraversamenti["a"] = a
+    return jd, cuspidi, attraversamenti[np.argsort(attraversamenti["jd"], kind="stable")]
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    from astropy.time import Time
+
+    # Montichiari, 10 giugno 1993 ore 10:15 UTC: cambi di segno entro ±12 ore
+    jd_nascita = Time("1993-06-10 10:15:00").jd
+    jd, cuspidi, passaggi = scansione(jd_nascita, 45.41317, 10.39799, passo_secondi=60)
+    print(f"{jd.size} istanti campionati, {passaggi.size} cambi di segno")
+    for passaggio in passaggi:
+        if passaggio["punto"] in (0, 9):  # ASC e MC
+            istante = Time(passaggio["jd"], format="jd").iso
+            print(f"{PUNTI[passaggio['punto']]}: segno {passaggio['da']} → {passaggio['a']} alle {istante} UTC")
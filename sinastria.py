@@ -0,0 +1,181 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from intervalli import blocchi_intervalli
+
+# (nome, angolo, orbe) in gradi
+ASPETTI = (
+    ("congiunzione", 0.0, 8.0),
+    ("sestile", 60.0, 4.0),
+    ("quadrato", 90.0, 6.0),
+    ("trigono", 120.0, 6.0),
+    ("opposizione", 180.0, 8.0),
+)
+
+DTYPE_ASPETTO = np.dtype([
+    ("carta_a", np.int64),    # riga nel primo batch
+    ("carta_b", np.int64),    # riga nel secondo batch
+    ("pianeta_a", np.int8),   # colonna del pianeta (ordine di effemeridi.CORPI)
+    ("pianeta_b", np.int8),
+    ("aspetto", np.int8),     # indice in `aspetti`
+    ("orbe", np.float32),     # scarto dall'aspetto esatto, in gradi
+])
+
+# Byte per aspetto trovato: il record più i temporanei (indici e float) con cui
+# si espandono le finestre e si controlla l'orbe
+BYTE_PER_ASPETTO = 80
+
+MEMORIA_PREDEFINITA = 256 * 2**20
+
+
+class _IndiceLongitudini:
+    """Longitudini del secondo batch ordinate per pianeta, ripetute a ±360° per la ricerca circolare."""
+
+    def __init__(self, longitudini):
+        longitudini = np.asarray(longitudini, dtype=float) % 360.0
+        self.n = longitudini.shape[0]
+        self.longitudini = longitudini
+        self.ordine = np.argsort(longitudini, axis=0, kind="stable")       # (M, P)
+        ordinate = np.take_along_axis(longitudini, self.ordine, axis=0)
+        self.esteso = np.concatenate([ordinate - 360.0, ordinate, ordinate + 360.0])  # (3M, P)
+
+
+def _aspetti_blocco(lon_a, primo, indice, aspetti, limite):
+    """Aspetti fra le righe `lon_a` (a partire da `primo`) e il batch indicizzato, a pezzi di al più `limite`."""
+    lon_a = np.asarray(lon_a, dtype=float) % 360.0
+    for pa in range(lon_a.shape[1]):
+        for pb in range(indice.longitudini.shape[1]):
+            esteso, ordine = indice.esteso[:, pb], indice.ordine[:, pb]
+            for k, (_, angolo, orbe) in enumerate(aspetti):
+                centri = [angolo] if angolo in (0.0, 180.0) else [angolo, -angolo]
+                for centro in centri:
+                    # Finestra [x - orbe, x + orbe] sul vettore ordinato: O(log M) per riga
+                    x = (lon_a[:, pa] + centro) % 360.0
+                    inizio = np.searchsorted(esteso, x - orbe, side="left")
+                    fine = np.searchsorted(esteso, x + orbe, side="right")
+                    for riga, posizione in blocchi_intervalli(inizio, fine, limite):
+                        j = ordine[posizione % indice.n]
+                        differenza = (indice.longitudini[j, pb] - lon_a[riga, pa]) % 360.0
+                        scarto = np.abs((differenza - centro + 180.0) % 360.0 - 180.0)
+
+                        trovati = np.empty(riga.size, dtype=DTYPE_ASPETTO)
+                        trovati["carta_a"] = primo + riga
+                        trovati["carta_b"] = j
+                        trovati["pianeta_a"] = pa
+                        trovati["pianeta_b"] = pb
+                        trovati["aspetto"] = k
+                        trovati["orbe"] = scarto
+                        yield trovati
+
+
+def _raggruppa(pezzi, limite):
+    """Unisce array consecutivi finché insieme non superano `limite` elementi."""
+    accumulati, n = [], 0
+    for pezzo in pezzi:
+        if accumulati and n + pezzo.size > limite:
+            yield np.concatenate(accumulati)
+            accumulati, n = [], 0
+        accumulati.append(pezzo)
+        n += pezzo.size
+    if accumulati:
+        yield np.concatenate(accumulati)
+
+
+def _a_pezzi(risultato, limite):
+    for i in range(0, risultato.size, limite):
+        yield risultato[i:i + limite]
+
+
+# Stato dei processi di lavoro: il secondo batch viene indicizzato una volta per processo
+_INDICE = None
+_ASPETTI = None
+_LIMITE = None
+
+
+def _inizializza_processo(lon_b, aspetti, limite):
+    global _INDICE, _ASPETTI, _LIMITE
+    _INDICE = _IndiceLongitudini(lon_b)
+    _ASPETTI = aspetti
+    _LIMITE = limite
+
+
+def _aspetti_blocco_processo(argomenti):
+    lon_a, primo = argomenti
+    pezzi = list(_aspetti_blocco(lon_a, primo, _INDICE, _ASPETTI, _LIMITE))
+    return np.concatenate(pezzi) if pezzi else np.empty(0, dtype=DTYPE_ASPETTO)
+
+
+def blocco_predefinito(n_b, pianeti_a, pianeti_b, aspetti=ASPETTI, memoria=MEMORIA_PREDEFINITA):
+    """
+    Carte del primo batch per blocco tali che gli aspetti attesi di un blocco
+    (longitudini distribuite uniformemente) occupino circa `memoria` byte.
+    """
+    finestre = sum((1 if angolo in (0.0, 180.0) else 2) * 2 * orbe for _, angolo, orbe in aspetti)
+    attesi_per_carta = max(n_b * pianeti_a * pianeti_b * finestre / 360.0, 1.0)
+    return max(1, int(memoria / BYTE_PER_ASPETTO / attesi_per_carta))
+
+
+def aspetti_sinastria(lon_a, lon_b, aspetti=ASPETTI, blocco=None, processi=None, memoria=MEMORIA_PREDEFINITA):
+    """
+    Trova tutti gli aspetti fra i pianeti delle carte di due batch (sinastria).
+
+    Le longitudini del secondo batch vengono ordinate una volta per pianeta; per
+    ogni blocco di carte del primo batch, la finestra d'orbe di ogni aspetto è
+    trovata con una ricerca binaria vettoriale, quindi si controllano solo le
+    coppie candidate invece di tutte le N × M.
+
+    Le finestre vengono espanse a pezzi di al più `memoria / BYTE_PER_ASPETTO`
+    aspetti e ogni array restituito non supera questa dimensione, qualunque
+    siano M e le orbite. Con `processi` > 1 ogni processo restituisce un blocco
+    intero, che con il `blocco` predefinito occupa in media `memoria`; in coda
+    ci sono al più due blocchi per processo.
+
+    Args:
+        lon_a (array): Longitudini (N, P), ad esempio `CartaBatch.dati["pianeti_lon"]`.
+        lon_b (array): Longitudini (M, P) del secondo batch.
+        aspetti (tuple): Elenco di (nome, angolo, orbe) in gradi (orbe < 180°).
+        blocco (int): Carte del primo batch per blocco (default: `blocco_predefinito`).
+        processi (int): Se > 1, blocchi distribuiti su un pool di processi.
+        memoria (int): Budget in byte per gli aspetti tenuti in memoria insieme.
+
+    Yields:
+        np.ndarray: Array strutturati `DTYPE_ASPETTO`.
+    """
+    lon_a = np.asarray(lon_a, dtype=float)
+    lon_b = np.asarray(lon_b, dtype=float)
+    limite = max(1, memoria // BYTE_PER_ASPETTO)
+    if blocco is None:
+        blocco = blocco_predefinito(lon_b.shape[0], lon_a.shape[1], lon_b.shape[1], aspetti, memoria)
+    blocchi = ((lon_a[i:i + blocco], i) for i in range(0, lon_a.shape[0], blocco))
+    if processi is None or processi <= 1:
+        indice = _IndiceLongitudini(lon_b)
+        for lon_blocco, primo in blocchi:
+            yield from _raggruppa(_aspetti_blocco(lon_blocco, primo, indice, aspetti, limite), limite)
+        return
+
+    # Al massimo due blocchi in coda per processo: i risultati non si accumulano
+    with ProcessPoolExecutor(max_workers=processi, initializer=_inizializza_processo,
+                             initargs=(lon_b, aspetti, limite)) as pool:
+        in_corso = deque()
+        for argomenti in blocchi:
+            in_corso.append(pool.submit(_aspetti_blocco_processo, argomenti))
+            if len(in_corso) >= 2 * processi:
+                yield from _a_pezzi(in_corso.popleft().result(), limite)
+        while in_corso:
+            yield from _a_pezzi(in_corso.popleft().result(), limite)
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    lon_a = rng.uniform(0, 360, (5_000, 10))
+    lon_b = rng.uniform(0, 360, (5_000, 10))
+    aspetti_stretti = tuple((nome, angolo, 0.5) for nome, angolo, _ in ASPETTI)
+
+    inizio = time.perf_counter()
+    totale = sum(blocco.size for blocco in aspetti_sinastria(lon_a, lon_b, aspetti_stretti, processi=4))
+    print(f"{totale} aspetti fra {len(lon_a)} × {len(lon_b)} carte in {time.perf_counter() - inizio:.2f} s")
@@ -0,0 +1,129 @@
+import csv
+import os
+
+import numpy as np
+
+from ayanamsa import ayanamsa as calcola_ayanamsa, precessione_generale
+from intervalli import espandi_intervalli
+
+# Sottoinsieme locale del catalogo Hipparcos (hip, nome, ra, dec, vmag; J2000)
+PERCORSO_PREDEFINITO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dati", "stelle.csv")
+
+# Obliquità dell'eclittica a J2000 (IAU 2006), in gradi
+OBLIQUITA_J2000 = 23.4392911
+
+DTYPE_CONGIUNZIONE = np.dtype([
+    ("punto", np.int64),     # indice (appiattito) nell'array di longitudini interrogato
+    ("stella", np.int32),    # riga nel catalogo
+    ("orbe", np.float32),    # distanza in longitudine, in gradi
+])
+
+
+def equatoriali_a_eclittiche(ra, dec, obliquita=OBLIQUITA_J2000):
+    """Da ascensione retta e declinazione a (longitudine, latitudine) eclittiche, in gradi, su array."""
+    ra, dec, eps = np.radians(ra), np.radians(dec), np.radians(obliquita)
+    longitudine = np.arctan2(np.sin(ra) * np.cos(eps) + np.tan(dec) * np.sin(eps), np.cos(ra))
+    latitudine = np.arcsin(np.sin(dec) * np.cos(eps) - np.cos(dec) * np.sin(eps) * np.sin(ra))
+    return np.degrees(longitudine) % 360.0, np.degrees(latitudine)
+
+
+class CatalogoStelle:
+    """
+    Catalogo di stelle fisse con indice ordinato per longitudine eclittica.
+
+    Le coordinate vengono convertite una sola volta nell'eclittica J2000. La
+    precessione generale sposta tutte le longitudini della stessa quantità, quindi
+    l'ordine resta valido a ogni data: invece di precessare il catalogo si riportano
+    a J2000 i punti interrogati. Moto proprio, nutazione e aberrazione sono
+    trascurati: rispetto alle posizioni apparenti di Skyfield lo scarto resta
+    sotto 0.05° fra il 1900 e il 2100.
+    """
+
+    def __init__(self, hip, nomi, ra, dec, magnitudini):
+        self.hip = np.asarray(hip, dtype=np.int64)
+        self.nomi = np.asarray(nomi, dtype=object)
+        self.magnitudini = np.asarray(magnitudini, dtype=float)
+        self.longitudini_j2000, self.latitudini = equatoriali_a_eclittiche(ra, dec)
+
+        self._ordine = np.argsort(self.longitudini_j2000, kind="stable")
+        ordinate = self.longitudini_j2000[self._ordine]
+        self._esteso = np.concatenate([ordinate - 360.0, ordinate, ordinate + 360.0])
+
+    @classmethod
+    def carica(cls, percorso=PERCORSO_PREDEFINITO, magnitudine_max=None):
+        """
+        Carica un CSV con colonne hip, nome, ra, dec, vmag (righe con # ignorate).
+
+        Args:
+            percorso (str): File del catalogo.
+            magnitudine_max (float): Se data, scarta le stelle più deboli.
+        """
+        with open(percorso, encoding="utf-8") as f:
+            righe = list(csv.DictReader(riga for riga in f if not riga.startswith("#")))
+        if magnitudine_max is not None:
+            righe = [r for r in righe if float(r["vmag"]) <= magnitudine_max]
+        return cls([r["hip"] for r in righe], [r["nome"] for r in righe],
+                   [float(r["ra"]) for r in righe], [float(r["dec"]) for r in righe],
+                   [float(r["vmag"]) for r in righe])
+
+    def __len__(self):
+        return len(self.nomi)
+
+    def longitudini(self, jd):
+        """Longitudini tropicali della data, con forma (len(catalogo), *jd.shape)."""
+        jd = np.asarray(jd, dtype=float)
+        return (self.longitudini_j2000.reshape((-1,) + (1,) * jd.ndim) + precessione_generale(jd)) % 360.0
+
+    def entro_orbe(self, longitudini, jd, orbe=1.0, ayanamsa=None):
+        """
+        Tutte le stelle entro `orbe` gradi di longitudine da ogni punto.
+
+        Ogni punto costa una ricerca binaria sull'indice più il numero di stelle
+        trovate, invece di una scansione dell'intero catalogo.
+
+        Args:
+            longitudini (array): Longitudini in gradi, di forma qualsiasi (pianeti,
+                cuspidi, ...), ad esempio `CartaBatch.dati["pianeti_lon"]`.
+            jd (array): Giorni giuliani dei punti, broadcast con `longitudini`.
+            orbe (float): Orbe in gradi (< 180).
+            ayanamsa (str): Se le longitudini sono siderali, il modello usato.
+
+        Returns:
+            np.ndarray: Array strutturato `DTYPE_CONGIUNZIONE`; `punto` indicizza
+            `np.ravel` del broadcast di `longitudini` e `jd`.
+        """
+        longitudini, jd = np.broadcast_arrays(np.asarray(longitudini, dtype=float),
+                                              np.asarray(jd, dtype=float))
+        longitudini, jd = longitudini.ravel(), jd.ravel()
+
+        # Punto riportato nell'eclittica J2000 del catalogo
+        spostamento = precessione_generale(jd)
+        if ayanamsa is not None:
+            spostamento = spostamento - calcola_ayanamsa(jd, ayanamsa)
+        x = (longitudini - spostamento) % 360.0
+
+        inizio = np.searchsorted(self._esteso, x - orbe, side="left")
+        fine = np.searchsorted(self._esteso, x + orbe, side="right")
+        punto, posizione = espandi_intervalli(inizio, fine)
+
+        trovati = np.empty(punto.size, dtype=DTYPE_CONGIUNZIONE)
+        trovati["punto"] = punto
+        trovati["stella"] = self._ordine[posizione % len(self)]
+        trovati["orbe"] = np.abs(self._esteso[posizione] - x[punto])
+        return trovati
+
+
+# ======= ESEMPIO D'USO ==========
+if __name__ == "__main__":
+    from carta_batch import ANGOLI, PIANETI, CartaBatch
+
+    # Montichiari, 10 giugno 1993 ore 10:15 UTC (come legacy/advanced.py)
+    carta = CartaBatch.calcola(2449148.927083, 45.41317, 10.39799)
+    catalogo = CatalogoStelle.carica()
+    punti = np.concatenate([carta.dati["pianeti_lon"][0], carta.dati["angoli"][0]])
+    etichette = PIANETI + ANGOLI
+
+    for trovato in catalogo.entro_orbe(punti, carta.dati["jd"][0], orbe=2.0):
+        stella = trovato["stella"]
+        print(f"{etichette[trovato['punto']]} congiunto a {catalogo.nomi[stella]} "
+              f"(mag {catalogo.magnitudini[stella]:.2f}), orbe {trovato['orbe']:.2f}°")
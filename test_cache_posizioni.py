@@ -0,0 +1,41 @@
+import sqlite3
+
+import numpy as np
+
+from cache_posizioni import CachePosizioni
+
+
+def _scrivi(cache, primo, n):
+    istanti = np.arange(primo, primo + n)
+    cache.scrivi("Sole", istanti, np.zeros((n, 3)))
+
+
+def test_conteggio_con_piu_connessioni(tmp_path):
+    percorso = str(tmp_path / "posizioni.sqlite")
+    for primo in (0, 10, 5):
+        cache = CachePosizioni(percorso, "bassa")
+        _scrivi(cache, primo, 10)
+        cache.chiudi()
+
+    prima, seconda = CachePosizioni(percorso, "bassa"), CachePosizioni(percorso, "bassa")
+    assert prima.righe() == seconda.righe() == 20
+    with sqlite3.connect(percorso) as c:
+        assert c.execute("SELECT COUNT(*) FROM conteggio").fetchone() == (1,)
+        assert c.execute("SELECT COUNT(*) FROM posizioni").fetchone() == (20,)
+
+
+def test_conteggio_di_un_file_esistente(tmp_path):
+    percorso = str(tmp_path / "posizioni.sqlite")
+    _scrivi(CachePosizioni(percorso, "bassa"), 0, 10)
+    with sqlite3.connect(percorso) as c:
+        c.execute("DROP TABLE conteggio")
+    assert CachePosizioni(percorso, "bassa").righe() == 10
+
+
+def test_sfratto(tmp_path):
+    cache = CachePosizioni(str(tmp_path / "posizioni.sqlite"), "bassa", max_righe=100)
+    for primo in range(0, 150, 30):
+        _scrivi(cache, primo, 30)
+    assert cache.righe() <= 100
+    presenti, _ = cache.leggi("Sole", np.arange(120, 150))
+    assert presenti.all()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from carta_batch import angoli_batch
+from kernel_angoli import NUMBA_DISPONIBILE
+
+BACKEND = [
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(not NUMBA_DISPONIBILE, reason="numba non installato")),
+]
+
+JD, LATITUDINE, LONGITUDINE = 2449148.927083, 45.41317, 10.39799
+
+
+@pytest.mark.parametrize("ayanamsa", [None, "lahiri"])
+@pytest.mark.parametrize("backend", BACKEND)
+def test_angoli_batch_scalare_come_array(backend, ayanamsa):
+    scalare = angoli_batch(JD, LATITUDINE, LONGITUDINE, backend=backend, ayanamsa=ayanamsa)
+    vettore = angoli_batch(np.array([JD]), LATITUDINE, LONGITUDINE, backend=backend, ayanamsa=ayanamsa)
+    for nome, valori in scalare.items():
+        assert np.shape(valori) == ()
+        assert valori == pytest.approx(vettore[nome][0], abs=1e-12)
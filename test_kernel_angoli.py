@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+import kernel_angoli
+from kernel_angoli import NUMBA_DISPONIBILE, ascendente, punti_cardinali
+
+OBLIQUITA = 23.4393
+SINE, COSINE = math.sin(math.radians(OBLIQUITA)), math.cos(math.radians(OBLIQUITA))
+TOLLERANZA = 1e-9  # gradi
+
+BACKEND = [
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(not NUMBA_DISPONIBILE, reason="numba non installato")),
+]
+
+
+def _scarto(a, b):
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+
+@pytest.fixture(scope="module")
+def ingressi():
+    rng = np.random.default_rng(0)
+    casuali_x1 = rng.uniform(-360, 720, 20_000)
+    casuali_lat = rng.uniform(-90, 90, 20_000)
+    # Casi limite: x1 multipli di 90° (anche fuori da 0-360°) per ogni latitudine notevole
+    limite_x1, limite_lat = np.meshgrid(np.arange(-360, 721, 90.0), [-90.0, -66.56, 0.0, 45.0, 66.56, 90.0])
+    x1 = np.concatenate([casuali_x1, limite_x1.ravel()])
+    latitudine = np.concatenate([casuali_lat, limite_lat.ravel()])
+    return x1, latitudine
+
+
+@pytest.mark.parametrize("backend", BACKEND)
+def test_ascendente_come_kernel_scalare(backend, ingressi):
+    x1, latitudine = ingressi
+    atteso = [kernel_angoli._ascendente(a, b, SINE, COSINE) for a, b in zip(x1, latitudine)]
+    ottenuto = ascendente(x1, latitudine, SINE, COSINE, backend=backend)
+    assert ottenuto.shape == x1.shape
+    assert _scarto(ottenuto, atteso).max() <= TOLLERANZA
+
+
+@pytest.mark.parametrize("backend", BACKEND)
+def test_ascendente_ai_poli(backend):
+    assert ascendente(np.array([10.0, 200.0]), 90.0, SINE, COSINE, backend=backend).tolist() == [180.0, 180.0]
+    assert ascendente(np.array([10.0, 200.0]), -90.0, SINE, COSINE, backend=backend).tolist() == [0.0, 0.0]
+
+
+@pytest.mark.parametrize("backend", BACKEND)
+def test_punti_cardinali_come_kernel_scalare(backend, ingressi):
+    x1, latitudine = ingressi
+    lst = (x1 % 360) / 15
+    atteso = np.array([kernel_angoli._asc_mc(a, b, OBLIQUITA) for a, b in zip(lst, latitudine)])
+    punti = punti_cardinali(lst, latitudine, OBLIQUITA, backend=backend)
+    assert _scarto(punti["ASC"], atteso[:, 0]).max() <= TOLLERANZA
+    assert _scarto(punti["MC"], atteso[:, 1]).max() <= TOLLERANZA
+    assert _scarto(punti["DSC"], punti["ASC"] + 180).max() <= TOLLERANZA
+    assert _scarto(punti["IC"], punti["MC"] + 180).max() <= TOLLERANZA
+
+
+@pytest.mark.skipif(not NUMBA_DISPONIBILE, reason="numba non installato")
+def test_backend_identici(ingressi):
+    x1, latitudine = ingressi
+    numpy = ascendente(x1, latitudine, SINE, COSINE, backend="numpy")
+    numba = ascendente(x1, latitudine, SINE, COSINE, backend="numba")
+    assert _scarto(numpy, numba).max() <= TOLLERANZA